@@ -0,0 +1,116 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from storage import get_storage
+from metrics import CACHE_LOOKUPS
+from features import decode_features
+from config import DATABASE_PATH, ANALYSIS_COOLDOWN_HOURS, ANALYSIS_CACHE_SIZE, PARTIAL_ANALYSIS_CACHE_MINUTES
+
+class AnalysisCache:
+    """Read-through cache of recent analyses: in-process LRU backed by analysis_results"""
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_SIZE, cooldown_hours=ANALYSIS_COOLDOWN_HOURS):
+        self.db_path = DATABASE_PATH
+        self.storage = get_storage(self.db_path)
+        self.max_entries = max_entries
+        self.cooldown_hours = cooldown_hours
+        self.ttl_seconds = cooldown_hours * 3600
+        self.partial_ttl_seconds = PARTIAL_ANALYSIS_CACHE_MINUTES * 60
+        self.logger = logging.getLogger(__name__)
+        self._entries = OrderedDict()  # username -> (expires_at, analysis)
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """Return a stored analysis still inside the cooldown window, or None"""
+        key = username.lower()
+
+        analysis = self._get_from_memory(key)
+        if analysis is not None:
+            CACHE_LOOKUPS.inc(cache='analysis', result='memory_hit')
+            return dict(analysis)
+
+        analysis, analyzed_at = self._load_from_db(key)
+        if analysis is None:
+            CACHE_LOOKUPS.inc(cache='analysis', result='miss')
+            return None
+
+        CACHE_LOOKUPS.inc(cache='analysis', result='db_hit')
+
+        self._put_in_memory(key, analysis, analyzed_at + self.ttl_seconds)
+        return dict(analysis)
+
+    def put(self, analysis):
+        """Cache a freshly computed analysis; one with a cut-off follower scan only briefly"""
+        key = analysis['username'].lower()
+        complete = analysis.get('trusted_followers_complete', True)
+        ttl_seconds = self.ttl_seconds if complete else min(self.partial_ttl_seconds, self.ttl_seconds)
+        self._put_in_memory(key, dict(analysis), time.time() + ttl_seconds)
+
+    def _get_from_memory(self, key):
+        """Look up the LRU tier, expiring stale entries"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, analysis = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return analysis
+
+    def _put_in_memory(self, key, analysis, expires_at):
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (expires_at, analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load_from_db(self, key):
+        """Load a stored analysis from SQLite if it is inside the cooldown window"""
+        try:
+            row = self.storage.fetchone('''
+                SELECT *, CAST(strftime('%s', analysis_date) AS INTEGER) AS analyzed_at
+                FROM analysis_results
+                WHERE username = ? COLLATE NOCASE
+                  AND analysis_date > datetime('now', ?)
+                  AND risk_factors IS NOT NULL
+                  AND trusted_followers_complete = 1
+            ''', (key, f'-{self.cooldown_hours} hours'))
+
+            if row is None:
+                return None, None
+
+            return self._row_to_analysis(row), row['analyzed_at']
+
+        except Exception as e:
+            self.logger.error(f"Error loading cached analysis for {key}: {e}")
+            return None, None
+
+    def _row_to_analysis(self, row):
+        """Rebuild an analysis dict from an analysis_results row"""
+        return {
+            'user_id': row['user_id'],
+            'username': row['username'],
+            'account_age_days': row['account_age_days'],
+            'follower_count': row['follower_count'],
+            'following_count': row['following_count'],
+            'tweet_count': row['tweet_count'],
+            'verified': bool(row['verified']),
+            'follower_ratio': row['follower_ratio'],
+            'bio_length': row['bio_length'],
+            'bio_keywords': row['bio_keywords'].split(',') if row['bio_keywords'] else [],
+            'avg_engagement': row['avg_engagement'],
+            'trusted_followers_count': row['trusted_followers_count'],
+            'trusted_followers': json.loads(row['trusted_followers'] or '[]'),
+            'trusted_followers_complete': True,
+            'trustworthiness_score': int(row['trustworthiness_score']),
+            'risk_factors': json.loads(row['risk_factors']),
+            'positive_indicators': json.loads(row['positive_indicators'] or '[]'),
+            'spam_indicators': decode_features(row['features'])['spam_indicators'] if row['features'] else None
+        }
@@ -1,9 +1,20 @@
-import sqlite3
+import json
 import logging
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from textblob import TextBlob
 from trusted_accounts import TrustedAccountsManager
+from analysis_cache import AnalysisCache
+from storage import get_storage
+from metrics import timed_stage
+from stats import record_stat, STAT_ANALYSES
+from features import encode_features
+from text_matcher import TermMatcher
+from fingerprint import simhash, near_duplicate_ratio, to_signed
+from scam_network import ScamNetworkIndex, index_bands
+from trusted_graph import TrustedGraphIndex
 from config import *
 
 class AccountAnalyzer:
@@ -12,26 +23,65 @@ class AccountAnalyzer:
         self.trusted_manager = TrustedAccountsManager()
         self.logger = logging.getLogger(__name__)
         self.db_path = DATABASE_PATH
+        self.storage = get_storage(self.db_path)
+        self.analysis_cache = AnalysisCache()
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=ANALYSIS_FETCH_WORKERS,
+            thread_name_prefix='analyzer-fetch'
+        )
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.bio_keyword_matcher = TermMatcher(BIO_KEYWORDS)
+        self.promo_matcher = TermMatcher(PROMO_TERMS)
+        self.scam_network = ScamNetworkIndex(self.db_path)
+        self.trusted_graph = TrustedGraphIndex(x_client, self.trusted_manager, self.db_path)
     
     def analyze_account(self, username):
         """Perform comprehensive account analysis"""
+        # Reuse a recent analysis while the account is in its cooldown window
+        cached = self.analysis_cache.get(username)
+        if cached:
+            self.logger.info(f"Using cached analysis for @{username}")
+            return cached
+        
+        # Concurrent triggers for the same account share a single analysis
+        key = username.lower()
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = Future()
+        
+        if pending is not None:
+            self.logger.info(f"Waiting for in-flight analysis of @{username}")
+            return pending.result()
+        
+        analysis = None
+        try:
+            analysis = self._analyze_uncached(username)
+            return analysis
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key).set_result(analysis)
+    
+    def _analyze_uncached(self, username):
+        """Fetch account data from the X API and analyze it"""
         try:
             # Get user information
             user_info = self.x_client.get_user_info(username)
             if not user_info:
                 return None
             
-            # Get recent tweets
-            tweets = self.x_client.get_user_tweets(user_info['id'], max_results=20)
-            
-            # Get followers (limited sample)
-            followers = self.x_client.get_user_followers(user_info['id'], max_results=100)
+            # Fetch recent tweets and scan followers for trusted accounts in parallel
+            tweets_future, trusted_future = self._submit_fetches(user_info)
+            tweets = tweets_future.result()
+            trusted_followers, trusted_complete = trusted_future.result()
             
             # Perform analysis
-            analysis = self._perform_analysis(user_info, tweets, followers)
+            analysis = self._perform_analysis(user_info, tweets, trusted_followers, trusted_complete)
             
             # Store results
             self._store_analysis(analysis)
+            self.analysis_cache.put(analysis)
             
             return analysis
             
@@ -39,7 +89,100 @@ class AccountAnalyzer:
             self.logger.error(f"Error analyzing account {username}: {e}")
             return None
     
-    def _perform_analysis(self, user_info, tweets, followers):
+    def analyze_accounts(self, usernames):
+        """Analyze many accounts with one bulk profile lookup; returns {lowercase username: analysis}"""
+        results = {}
+        owned = []
+        pending = {}
+        
+        for username in dict.fromkeys(u.lstrip('@').lower() for u in usernames):
+            cached = self.analysis_cache.get(username)
+            if cached:
+                results[username] = cached
+                continue
+            
+            # Share analyses already in flight from other callers
+            with self._inflight_lock:
+                future = self._inflight.get(username)
+                if future is None:
+                    self._inflight[username] = Future()
+                    owned.append(username)
+                else:
+                    pending[username] = future
+        
+        if owned:
+            self.logger.info(f"Analyzing {len(owned)} accounts ({len(results)} cached)")
+        
+        analyses = {}
+        try:
+            analyses = self._analyze_batch(owned)
+        finally:
+            with self._inflight_lock:
+                for username in owned:
+                    self._inflight.pop(username).set_result(analyses.get(username))
+        
+        results.update(analyses)
+        for username, future in pending.items():
+            results[username] = future.result()
+        
+        return results
+    
+    def _analyze_batch(self, usernames):
+        """Fetch and analyze uncached accounts, storing the results in one transaction"""
+        if not usernames:
+            return {}
+        
+        analyses = dict.fromkeys(usernames)
+        try:
+            user_infos = self.x_client.get_users_info(usernames)
+            
+            # Queue every account's tweet fetch and follower scan before waiting on any
+            fetches = {
+                username: (user_infos[username],) + self._submit_fetches(user_infos[username])
+                for username in usernames if username in user_infos
+            }
+            
+            for username, (user_info, tweets_future, trusted_future) in fetches.items():
+                try:
+                    analyses[username] = self._perform_analysis(
+                        user_info, tweets_future.result(), *trusted_future.result()
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error analyzing account {username}: {e}")
+            
+            stored = [analysis for analysis in analyses.values() if analysis]
+            if stored:
+                self._store_analyses(stored)
+                for analysis in stored:
+                    self.analysis_cache.put(analysis)
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing {len(usernames)} accounts: {e}")
+        
+        return analyses
+    
+    def _submit_fetches(self, user_info):
+        """Start the tweet fetch and trusted follower scan for an account on the shared pool"""
+        tweets_future = self.fetch_executor.submit(
+            self.x_client.get_user_tweets, user_info['id'], max_results=20
+        )
+        trusted_future = self.fetch_executor.submit(self._find_trusted_followers, user_info['id'])
+        return tweets_future, trusted_future
+    
+    def _find_trusted_followers(self, user_id):
+        """Look up trusted followers in the trusted graph index, paging through followers while it is incomplete;
+        returns (trusted followers, whether the lookup was complete)"""
+        trusted_followers, complete = self.trusted_graph.trusted_followers(user_id)
+        if complete or len(trusted_followers) >= TRUSTED_FOLLOWERS_TARGET:
+            return trusted_followers, True
+        
+        # Some trusted accounts are not synced yet, so their follows can only be seen from this side
+        scanned, complete = self.trusted_manager.find_trusted_followers(self.x_client.iter_follower_pages(user_id))
+        trusted_followers = sorted(set(trusted_followers).union(scanned))
+        return trusted_followers, complete or len(trusted_followers) >= TRUSTED_FOLLOWERS_TARGET
+    
+    @timed_stage('scoring')
+    def _perform_analysis(self, user_info, tweets, trusted_followers, trusted_followers_complete=True):
         """Perform detailed analysis of account data"""
         analysis = {
             'user_id': user_info['id'],
@@ -65,10 +208,21 @@ class AccountAnalyzer:
         # Analyze engagement
         analysis['avg_engagement'] = self._calculate_engagement(tweets)
         
-        # Check trusted followers
-        trusted_count, trusted_list = self.trusted_manager.check_trusted_followers(followers)
-        analysis['trusted_followers_count'] = trusted_count
-        analysis['trusted_followers'] = trusted_list
+        # Trusted followers found by the follower scan; a deferred scan may have missed some
+        analysis['trusted_followers_count'] = len(trusted_followers)
+        analysis['trusted_followers'] = trusted_followers
+        analysis['trusted_followers_complete'] = trusted_followers_complete
+        if not trusted_followers_complete:
+            self.logger.warning(f"Follower scan of @{user_info['username']} was cut off; the result is cached briefly")
+        
+        # Fingerprint tweet content and check it for spam patterns
+        fingerprints = [simhash(tweet['text']) for tweet in tweets]
+        analysis['tweet_fingerprints'] = [
+            (tweet['id'], fingerprint, index_bands(tweet['text'], fingerprint))
+            for tweet, fingerprint in zip(tweets, fingerprints)
+        ]
+        analysis['spam_indicators'] = self._check_spam_patterns(tweets, fingerprints)
+        analysis['spam_indicators'] += self._check_scam_network(analysis)
         
         # Calculate trustworthiness score
         analysis['trustworthiness_score'] = self._calculate_trustworthiness_score(analysis)
@@ -86,17 +240,8 @@ class AccountAnalyzer:
         if not bio:
             return []
         
-        # Common crypto/solana related keywords
-        crypto_keywords = [
-            'crypto', 'blockchain', 'solana', 'defi', 'nft', 'web3',
-            'bitcoin', 'ethereum', 'trading', 'investor', 'developer',
-            'founder', 'ceo', 'project', 'token', 'dapp'
-        ]
-        
-        bio_lower = bio.lower()
-        found_keywords = [kw for kw in crypto_keywords if kw in bio_lower]
-        
-        return found_keywords
+        # Crypto/solana related keywords from BIO_KEYWORDS, in configured order
+        return self.bio_keyword_matcher.find_all(bio)
     
     def _calculate_engagement(self, tweets):
         """Calculate average engagement rate"""
@@ -178,8 +323,10 @@ class AccountAnalyzer:
         if analysis['avg_engagement'] < 1:
             risks.append("Very low engagement rates")
         
-        # Analyze tweet content for spam patterns
-        spam_indicators = self._check_spam_patterns(tweets)
+        # Spam patterns found in the tweet content
+        spam_indicators = analysis.get('spam_indicators')
+        if spam_indicators is None:
+            spam_indicators = self._check_spam_patterns(tweets)
         if spam_indicators:
             risks.extend(spam_indicators)
         
@@ -209,62 +356,118 @@ class AccountAnalyzer:
         
         return positives
     
-    def _check_spam_patterns(self, tweets):
+    def _check_spam_patterns(self, tweets, fingerprints=None):
         """Check for spam patterns in tweets"""
         if not tweets:
             return []
         
         spam_indicators = []
         
-        # Check for excessive repetition
-        texts = [tweet['text'] for tweet in tweets]
-        if len(set(texts)) < len(texts) * 0.5:
+        # Check for excessive repetition, counting near-identical tweets as repeats
+        if near_duplicate_ratio([tweet['text'] for tweet in tweets], fingerprints) > 0.5:
             spam_indicators.append("High content repetition detected")
         
         # Check for excessive promotional content
-        promo_count = 0
-        for tweet in tweets:
-            text = tweet['text'].lower()
-            if any(word in text for word in ['buy', 'sell', 'pump', 'moon', 'gem', 'x100']):
-                promo_count += 1
+        promo_count = sum(1 for tweet in tweets if self.promo_matcher.contains_any(tweet['text']))
         
         if promo_count > len(tweets) * 0.7:
             spam_indicators.append("Excessive promotional content")
         
         return spam_indicators
     
+    def _check_scam_network(self, analysis):
+        """Check whether the account reposts tweets from accounts already scored as high risk"""
+        indexed = [(fingerprint, bands) for _, fingerprint, bands in analysis['tweet_fingerprints'] if bands]
+        if not indexed:
+            return []
+        
+        matches = self.scam_network.matching_accounts(analysis['user_id'], indexed)
+        if not matches:
+            return []
+        
+        self.logger.info(f"@{analysis['username']} shares tweet content with {len(matches)} high-risk accounts")
+        return ["Tweets copied from known high-risk accounts"]
+    
     def _store_analysis(self, analysis):
         """Store analysis results in database"""
+        self._store_analyses([analysis])
+    
+    @timed_stage('db_write')
+    def _store_analyses(self, analyses):
+        """Store several analysis results and append them to the history in one transaction"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO analysis_results 
-                (user_id, username, account_age_days, follower_count, following_count,
-                 follower_ratio, bio_length, bio_keywords, avg_engagement, 
-                 trusted_followers_count, trustworthiness_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                analysis['user_id'],
-                analysis['username'],
-                analysis['account_age_days'],
-                analysis['follower_count'],
-                analysis['following_count'],
-                analysis['follower_ratio'],
-                analysis['bio_length'],
-                ','.join(analysis['bio_keywords']),
-                analysis['avg_engagement'],
-                analysis['trusted_followers_count'],
-                analysis['trustworthiness_score']
-            ))
-            
-            conn.commit()
-            conn.close()
+            rows = [self._analysis_row(analysis) for analysis in analyses]
+            with self.storage.transaction() as conn:
+                # Update in place so the row keeps its id; the history table keeps earlier analyses
+                conn.executemany('''
+                    INSERT INTO analysis_results 
+                    (user_id, username, account_age_days, follower_count, following_count,
+                     follower_ratio, bio_length, bio_keywords, avg_engagement, 
+                     trusted_followers_count, trustworthiness_score, tweet_count, verified,
+                     trusted_followers, risk_factors, positive_indicators, features, trusted_followers_complete)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        username = excluded.username,
+                        account_age_days = excluded.account_age_days,
+                        follower_count = excluded.follower_count,
+                        following_count = excluded.following_count,
+                        follower_ratio = excluded.follower_ratio,
+                        bio_length = excluded.bio_length,
+                        bio_keywords = excluded.bio_keywords,
+                        avg_engagement = excluded.avg_engagement,
+                        trusted_followers_count = excluded.trusted_followers_count,
+                        trustworthiness_score = excluded.trustworthiness_score,
+                        tweet_count = excluded.tweet_count,
+                        verified = excluded.verified,
+                        trusted_followers = excluded.trusted_followers,
+                        risk_factors = excluded.risk_factors,
+                        positive_indicators = excluded.positive_indicators,
+                        features = excluded.features,
+                        trusted_followers_complete = excluded.trusted_followers_complete,
+                        analysis_date = CURRENT_TIMESTAMP
+                ''', rows)
+                conn.executemany('''
+                    INSERT OR IGNORE INTO tweet_fingerprints
+                    (tweet_id, user_id, simhash, band0, band1, band2, band3)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (int(tweet_id), str(analysis['user_id']), to_signed(fingerprint), *(bands or (None,) * 4))
+                    for analysis in analyses
+                    for tweet_id, fingerprint, bands in analysis.get('tweet_fingerprints', [])
+                ])
+                conn.executemany('''
+                    INSERT INTO analysis_history 
+                    (user_id, username, trustworthiness_score, features, trusted_followers)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(row[0], row[1], row[10], row[16], row[13]) for row in rows])
+                record_stat(conn, STAT_ANALYSES, len(analyses))
             
         except Exception as e:
             self.logger.error(f"Error storing analysis: {e}")
     
+    def _analysis_row(self, analysis):
+        """Convert an analysis dict into analysis_results column values"""
+        return (
+            analysis['user_id'],
+            analysis['username'],
+            analysis['account_age_days'],
+            analysis['follower_count'],
+            analysis['following_count'],
+            analysis['follower_ratio'],
+            analysis['bio_length'],
+            ','.join(analysis['bio_keywords']),
+            analysis['avg_engagement'],
+            analysis['trusted_followers_count'],
+            analysis['trustworthiness_score'],
+            analysis['tweet_count'],
+            int(bool(analysis['verified'])),
+            json.dumps(analysis['trusted_followers']),
+            json.dumps(analysis['risk_factors']),
+            json.dumps(analysis['positive_indicators']),
+            encode_features(analysis),
+            int(analysis.get('trusted_followers_complete', True))
+        )
+    
     def format_analysis_report(self, analysis):
         """Format analysis into a readable report"""
         if not analysis:
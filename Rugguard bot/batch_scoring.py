@@ -0,0 +1,199 @@
+"""
+Columnar batch scoring for RUGGUARD Bot
+Computes trust scores and risk/positive flag bitmasks for many feature vectors in one pass.
+Uses NumPy when it is installed and falls back to a plain Python loop with identical results.
+"""
+
+import functools
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only bulk jobs benefit from it
+    np = None
+
+# Risk factor bits, in the order AccountAnalyzer._identify_risk_factors lists them
+RISK_NEW_ACCOUNT = 1 << 0
+RISK_SUSPICIOUS_RATIO = 1 << 1
+RISK_NO_TRUSTED_FOLLOWERS = 1 << 2
+RISK_MINIMAL_BIO = 1 << 3
+RISK_LOW_ENGAGEMENT = 1 << 4
+
+RISK_MESSAGES = [
+    (RISK_NEW_ACCOUNT, "Very new account (less than 30 days)"),
+    (RISK_SUSPICIOUS_RATIO, "Suspicious follower/following ratio"),
+    (RISK_NO_TRUSTED_FOLLOWERS, "No trusted followers detected"),
+    (RISK_MINIMAL_BIO, "Minimal bio information"),
+    (RISK_LOW_ENGAGEMENT, "Very low engagement rates")
+]
+
+# Positive indicator bits, in the order AccountAnalyzer._identify_positive_indicators lists them
+POSITIVE_ESTABLISHED = 1 << 0
+POSITIVE_TRUSTED_FOLLOWERS = 1 << 1
+POSITIVE_VERIFIED = 1 << 2
+POSITIVE_HEALTHY_RATIO = 1 << 3
+POSITIVE_BIO_KEYWORDS = 1 << 4
+POSITIVE_ENGAGEMENT = 1 << 5
+
+POSITIVE_MESSAGES = [
+    (POSITIVE_ESTABLISHED, "Established account (1+ years)"),
+    (POSITIVE_TRUSTED_FOLLOWERS, "Followed by {trusted_followers_count} trusted accounts"),
+    (POSITIVE_VERIFIED, "Verified account"),
+    (POSITIVE_HEALTHY_RATIO, "Healthy follower/following ratio"),
+    (POSITIVE_BIO_KEYWORDS, "Relevant bio keywords present"),
+    (POSITIVE_ENGAGEMENT, "Good engagement rates")
+]
+
+def to_columns(features_list):
+    """Turn a list of feature dicts into the column lists score_columns expects"""
+    return {
+        'account_age_days': [f['account_age_days'] for f in features_list],
+        'follower_ratio': [f['follower_ratio'] for f in features_list],
+        'trusted_followers_count': [f['trusted_followers_count'] for f in features_list],
+        'verified': [bool(f['verified']) for f in features_list],
+        'bio_length': [f['bio_length'] for f in features_list],
+        'has_bio_keywords': [bool(f['bio_keywords']) for f in features_list],
+        'avg_engagement': [f['avg_engagement'] for f in features_list]
+    }
+
+def score_columns(columns):
+    """Return (scores, risk flags, positive flags) as parallel lists for columnar features"""
+    if np is None:
+        return _score_columns_python(columns)
+    return _score_columns_numpy(columns)
+
+def _score_columns_numpy(columns):
+    age = np.asarray(columns['account_age_days'], dtype=np.int64)
+    ratio = np.asarray(columns['follower_ratio'], dtype=np.float64)
+    trusted = np.asarray(columns['trusted_followers_count'], dtype=np.int64)
+    verified = np.asarray(columns['verified'], dtype=bool)
+    bio_length = np.asarray(columns['bio_length'], dtype=np.int64)
+    has_keywords = np.asarray(columns['has_bio_keywords'], dtype=bool)
+    engagement = np.asarray(columns['avg_engagement'], dtype=np.float64)
+
+    healthy_ratio = (ratio >= 0.1) & (ratio <= 10)
+
+    # np.select takes the first matching condition, mirroring each if/elif chain
+    score = np.full(age.shape, 50, dtype=np.int64)
+    score += np.select([age > 365, age > 180, age > 90, age < 30], [15, 10, 5, -20], 0)
+    score += np.select([healthy_ratio, ratio > 100], [10, -15], 0)
+    score += np.select([trusted >= 3, trusted >= 2, trusted >= 1], [25, 15, 5], 0)
+    score += np.where(verified, 10, 0)
+    score += np.where((bio_length > 50) & has_keywords, 5, 0)
+    score += np.select([engagement > 10, engagement > 50], [5, 10], 0)
+    score = np.clip(score, 0, 100)
+
+    risks = (
+        np.where(age < 30, RISK_NEW_ACCOUNT, 0)
+        | np.where(ratio > 50, RISK_SUSPICIOUS_RATIO, 0)
+        | np.where(trusted == 0, RISK_NO_TRUSTED_FOLLOWERS, 0)
+        | np.where(bio_length < 20, RISK_MINIMAL_BIO, 0)
+        | np.where(engagement < 1, RISK_LOW_ENGAGEMENT, 0)
+    )
+    positives = (
+        np.where(age > 365, POSITIVE_ESTABLISHED, 0)
+        | np.where(trusted >= 2, POSITIVE_TRUSTED_FOLLOWERS, 0)
+        | np.where(verified, POSITIVE_VERIFIED, 0)
+        | np.where(healthy_ratio, POSITIVE_HEALTHY_RATIO, 0)
+        | np.where(has_keywords, POSITIVE_BIO_KEYWORDS, 0)
+        | np.where(engagement > 10, POSITIVE_ENGAGEMENT, 0)
+    )
+    return score.tolist(), risks.tolist(), positives.tolist()
+
+def _score_columns_python(columns):
+    scores, risks, positives = [], [], []
+    for age, ratio, trusted, verified, bio_length, has_keywords, engagement in zip(
+        columns['account_age_days'], columns['follower_ratio'], columns['trusted_followers_count'],
+        columns['verified'], columns['bio_length'], columns['has_bio_keywords'], columns['avg_engagement']
+    ):
+        healthy_ratio = 0.1 <= ratio <= 10
+
+        score = 50
+        if age > 365:
+            score += 15
+        elif age > 180:
+            score += 10
+        elif age > 90:
+            score += 5
+        elif age < 30:
+            score -= 20
+        if healthy_ratio:
+            score += 10
+        elif ratio > 100:
+            score -= 15
+        if trusted >= 3:
+            score += 25
+        elif trusted >= 2:
+            score += 15
+        elif trusted >= 1:
+            score += 5
+        if verified:
+            score += 10
+        if bio_length > 50 and has_keywords:
+            score += 5
+        if engagement > 10:
+            score += 5
+        scores.append(max(0, min(100, score)))
+
+        risks.append(
+            (RISK_NEW_ACCOUNT if age < 30 else 0)
+            | (RISK_SUSPICIOUS_RATIO if ratio > 50 else 0)
+            | (RISK_NO_TRUSTED_FOLLOWERS if trusted == 0 else 0)
+            | (RISK_MINIMAL_BIO if bio_length < 20 else 0)
+            | (RISK_LOW_ENGAGEMENT if engagement < 1 else 0)
+        )
+        positives.append(
+            (POSITIVE_ESTABLISHED if age > 365 else 0)
+            | (POSITIVE_TRUSTED_FOLLOWERS if trusted >= 2 else 0)
+            | (POSITIVE_VERIFIED if verified else 0)
+            | (POSITIVE_HEALTHY_RATIO if healthy_ratio else 0)
+            | (POSITIVE_BIO_KEYWORDS if has_keywords else 0)
+            | (POSITIVE_ENGAGEMENT if engagement > 10 else 0)
+        )
+    return scores, risks, positives
+
+@functools.lru_cache(maxsize=None)
+def _risk_messages(flags):
+    return tuple(message for bit, message in RISK_MESSAGES if flags & bit)
+
+@functools.lru_cache(maxsize=4096)
+def _positive_messages(flags, trusted_followers_count):
+    return tuple(
+        message.format(trusted_followers_count=trusted_followers_count)
+        for bit, message in POSITIVE_MESSAGES if flags & bit
+    )
+
+def risk_messages(flags, spam_indicators=()):
+    """Expand a risk bitmask into the risk factor strings, followed by any spam indicators"""
+    return list(_risk_messages(flags)) + list(spam_indicators or [])
+
+def positive_messages(flags, trusted_followers_count):
+    """Expand a positive bitmask into the positive indicator strings"""
+    return list(_positive_messages(flags, trusted_followers_count))
+
+def score_features_batch(features_list):
+    """Score feature dicts in one columnar pass; returns (score, risks, positives) per entry"""
+    if not features_list:
+        return []
+    scores, risks, positives = score_columns(to_columns(features_list))
+
+    results = []
+    for features, score, risk, positive in zip(features_list, scores, risks, positives):
+        risk_list = list(_risk_messages(risk))
+        spam_indicators = features.get('spam_indicators')
+        if spam_indicators:
+            risk_list.extend(spam_indicators)
+        results.append((score, risk_list, list(_positive_messages(positive, features['trusted_followers_count']))))
+    return results
+
+def find_mismatches(analyzer, features_list):
+    """Compare the batch path with the analyzer's scalar scoring; returns (index, scalar, batch) per difference"""
+    mismatches = []
+    for index, (features, batch) in enumerate(zip(features_list, score_features_batch(features_list))):
+        scalar = (
+            analyzer._calculate_trustworthiness_score(features),
+            analyzer._identify_risk_factors(features, None),
+            analyzer._identify_positive_indicators(features, None)
+        )
+        if scalar != batch:
+            mismatches.append((index, scalar, batch))
+    return mismatches
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for RUGGUARD Bot
+Times the analyzer hot paths and a full monitoring cycle against the fake X API,
+writes JSON results and compares them with a stored baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BOT_DIR)
+
+DEFAULT_BASELINE = os.path.join(BOT_DIR, 'benchmarks', 'baseline.json')
+
+def measure(func, repeat=5, number=1):
+    """Time func() and return per-call statistics in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'repeat': repeat,
+        'number': number
+    }
+
+def synthetic_usernames(prefix, count, rng):
+    return [f"{prefix}{rng.randrange(10 ** 9)}" for _ in range(count)]
+
+def synthetic_tweets(count, rng):
+    from fake_x_api import TWEET_TEMPLATES
+    return [{
+        'id': i,
+        'text': rng.choice(TWEET_TEMPLATES) + f" https://t.co/{rng.randrange(100)}",
+        'created_at': None,
+        'retweet_count': rng.randrange(20),
+        'like_count': rng.randrange(200),
+        'reply_count': rng.randrange(10),
+        'quote_count': rng.randrange(5)
+    } for i in range(count)]
+
+def synthetic_user_info(rng):
+    return {
+        'id': rng.randrange(10 ** 15),
+        'username': 'benchmark_account',
+        'name': 'Benchmark',
+        'description': "Founder building DeFi on Solana. Previously blockchain developer at a web3 startup.",
+        'created_at': None,
+        'account_age_days': 400,
+        'followers_count': 12000,
+        'following_count': 800,
+        'tweet_count': 5000,
+        'verified': False
+    }
+
+def with_trusted_set(manager, trusted):
+    """Pin a trusted set on a TrustedAccountsManager so no database or network is touched"""
+    manager._trusted_set = frozenset(trusted)
+    manager._trusted_set_loaded_at = time.monotonic()
+    manager.refresh_seconds = float('inf')
+
+def bench_perform_analysis(results, quick):
+    from analyzer import AccountAnalyzer
+    rng = random.Random(1)
+    analyzer = AccountAnalyzer(x_client=None)
+    trusted = synthetic_usernames('trusted', 1000, rng)
+    with_trusted_set(analyzer.trusted_manager, trusted)
+    user_info = synthetic_user_info(rng)
+
+    sizes = [(20, 100), (200, 10000)] if quick else [(20, 100), (200, 10000), (2000, 100000)]
+    for tweet_count, follower_count in sizes:
+        tweets = synthetic_tweets(tweet_count, rng)
+        followers = synthetic_usernames('fan', follower_count, rng) + trusted[:3]
+        _, trusted_followers = analyzer.trusted_manager.check_trusted_followers(followers)
+        results[f"perform_analysis[tweets={tweet_count},followers={follower_count}]"] = measure(
+            lambda: analyzer._perform_analysis(user_info, tweets, trusted_followers), repeat=5 if quick else 10
+        )
+
+def bench_check_trusted_followers(results, quick):
+    from trusted_accounts import TrustedAccountsManager
+    rng = random.Random(2)
+    manager = TrustedAccountsManager()
+
+    trusted_sizes = [100, 1000] if quick else [100, 1000, 10000]
+    follower_sizes = [100, 10000] if quick else [100, 10000, 100000]
+    for trusted_count in trusted_sizes:
+        trusted = synthetic_usernames('trusted', trusted_count, rng)
+        with_trusted_set(manager, trusted)
+        for follower_count in follower_sizes:
+            followers = synthetic_usernames('Fan', follower_count, rng) + trusted[:5]
+            results[f"check_trusted_followers[trusted={trusted_count},followers={follower_count}]"] = measure(
+                lambda: manager.check_trusted_followers(followers), repeat=5 if quick else 10
+            )
+
+    # Paged scans: trusted followers on the first page end the scan there, none means reading every page
+    with_trusted_set(manager, trusted)
+    fans = synthetic_usernames('Fan', 10000, rng)
+    for label, followers in (('early', trusted[:3] + fans), ('none', fans)):
+        pages = [followers[start:start + 1000] for start in range(0, len(followers), 1000)]
+        results[f"find_trusted_followers[{label},pages={len(pages)}]"] = measure(
+            lambda: manager.find_trusted_followers(iter(pages)), repeat=5 if quick else 10
+        )
+
+def bench_spam_patterns(results, quick):
+    from analyzer import AccountAnalyzer
+    rng = random.Random(3)
+    analyzer = AccountAnalyzer(x_client=None)
+
+    for tweet_count in ([20, 200] if quick else [20, 200, 2000]):
+        tweets = synthetic_tweets(tweet_count, rng)
+        results[f"check_spam_patterns[tweets={tweet_count}]"] = measure(
+            lambda: analyzer._check_spam_patterns(tweets), repeat=5 if quick else 10, number=10
+        )
+
+def bench_near_duplicates(results, quick):
+    """Time near-duplicate clustering"""
+    from fingerprint import near_duplicate_groups
+    rng = random.Random(7)
+
+    for count in ([20, 200] if quick else [20, 200, 2000]):
+        fingerprints = [rng.getrandbits(64) for _ in range(count)]
+        results[f"near_duplicate_groups[fingerprints={count}]"] = measure(
+            lambda: near_duplicate_groups(fingerprints), repeat=5 if quick else 10, number=10
+        )
+
+def bench_text_matching(results, quick):
+    """Time the compiled term matcher as the vocabulary grows"""
+    from text_matcher import TermMatcher
+    from fake_x_api import TWEET_TEMPLATES
+    rng = random.Random(5)
+    texts = [rng.choice(TWEET_TEMPLATES) + ' ' + rng.choice(TWEET_TEMPLATES) for _ in range(200)]
+
+    for term_count in ([16, 500] if quick else [16, 500, 5000]):
+        terms = list(dict.fromkeys(
+            ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 8)))
+            for _ in range(term_count)
+        ))
+        matcher = TermMatcher(terms)
+        results[f"term_matcher[terms={term_count},texts={len(texts)}]"] = measure(
+            lambda: [matcher.find_all(text) for text in texts], repeat=5 if quick else 10
+        )
+
+def synthetic_features(count, rng):
+    """Feature dicts drawn around every scoring threshold, plus accounts following nobody"""
+    from features import follower_ratio
+    features = []
+    for _ in range(count):
+        follower_count = rng.choice([0, 1, 5, 10, 50, 100, 1000, 5000, 100000])
+        following_count = rng.choice([0, 1, 10, 100, 1000, 10000])
+        features.append({
+            'account_age_days': rng.choice([0, 29, 30, 31, 90, 91, 180, 181, 365, 366, 2000]),
+            'follower_count': follower_count,
+            'following_count': following_count,
+            'follower_ratio': follower_ratio(follower_count, following_count),
+            'tweet_count': rng.randrange(10000),
+            'verified': rng.random() < 0.2,
+            'bio_length': rng.choice([0, 19, 20, 50, 51, 160]),
+            'bio_keywords': rng.choice([[], ['crypto'], ['defi', 'solana']]),
+            'avg_engagement': rng.choice([0, 0.99, 1, 10, 10.01, 50, 50.5, rng.random() * 100]),
+            'trusted_followers_count': rng.randrange(5),
+            'spam_indicators': rng.choice([[], ["Excessive promotional content"]])
+        })
+    return features
+
+def bench_batch_scoring(results, quick):
+    """Time batch against per-account scoring"""
+    from analyzer import AccountAnalyzer
+    from batch_scoring import score_features_batch, score_columns, to_columns
+    rng = random.Random(4)
+    analyzer = AccountAnalyzer(x_client=None)
+
+    features = synthetic_features(10000 if quick else 100000, rng)
+    results[f"score_scalar[accounts={len(features)}]"] = measure(lambda: [(
+        analyzer._calculate_trustworthiness_score(f),
+        analyzer._identify_risk_factors(f, None),
+        analyzer._identify_positive_indicators(f, None)
+    ) for f in features], repeat=3 if quick else 5)
+    results[f"score_batch[accounts={len(features)}]"] = measure(
+        lambda: score_features_batch(features), repeat=3 if quick else 5
+    )
+    # Scores and flag bitmasks only, without expanding them into message lists
+    columns = to_columns(features)
+    results[f"score_batch_columns[accounts={len(features)}]"] = measure(
+        lambda: score_columns(columns), repeat=3 if quick else 5
+    )
+
+def bench_scam_network(results, quick):
+    """Time scam network lookups against a large fingerprint table"""
+    from migrations import migrate
+    from storage import get_storage
+    from fingerprint import to_signed
+    from scam_network import ScamNetworkIndex, index_bands
+    rng = random.Random(6)
+    db_path = 'scam_network_bench.db'
+    migrate(db_path)
+    storage = get_storage(db_path)
+
+    fingerprint_count = 100000 if quick else 1000000
+    account_count = fingerprint_count // 20
+    rows = []
+    for tweet_id in range(fingerprint_count):
+        fingerprint = rng.getrandbits(64)
+        rows.append((tweet_id, str(tweet_id % account_count), to_signed(fingerprint),
+                     *index_bands('x' * 20, fingerprint)))
+    with storage.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO tweet_fingerprints (tweet_id, user_id, simhash, band0, band1, band2, band3)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        # Every tenth account is high risk
+        conn.executemany('''
+            INSERT INTO analysis_results (user_id, username, trustworthiness_score) VALUES (?, ?, ?)
+        ''', [(str(user), f"account{user}", 20 if user % 10 == 0 else 70) for user in range(account_count)])
+
+    index = ScamNetworkIndex(db_path)
+    tweets = [(fp, index_bands('x' * 20, fp)) for fp in (rng.getrandbits(64) for _ in range(20))]
+    results[f"scam_network_lookup[fingerprints={fingerprint_count},tweets=1]"] = measure(
+        lambda: index.matching_accounts('new', tweets[:1]), repeat=5 if quick else 10, number=10
+    )
+    results[f"scam_network_lookup[fingerprints={fingerprint_count},tweets=20]"] = measure(
+        lambda: index.matching_accounts('new', tweets), repeat=5 if quick else 10
+    )
+
+def bench_monitoring_cycle(results, quick, server):
+    from bot import RugguardBot
+    bot = RugguardBot()
+    with_trusted_set(bot.analyzer.trusted_manager, server.data.trusted_accounts)
+
+    cycles = 3 if quick else 10
+    timings = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        bot.run_monitoring_cycle()
+        timings.append(time.perf_counter() - start)
+
+    triggers = server.data.triggers_per_search
+    results['monitoring_cycle'] = {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'first_cycle': timings[0],
+        'repeat': cycles,
+        'number': 1,
+        'triggers_per_cycle': triggers,
+        'replies_posted': server.data.replies_posted,
+        'api_requests': dict(server.request_counts)
+    }
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline median, current median) for benchmarks slower than the threshold"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous and current['median'] > previous['median'] * (1 + threshold):
+            regressions.append((name, previous['median'], current['median']))
+    return regressions
+
+def main():
+    """Run the benchmark suite"""
+    parser = argparse.ArgumentParser(description="RUGGUARD Bot benchmarks")
+    parser.add_argument('-o', '--output', help="Write JSON results to this file")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--quick', action='store_true', help="Smaller inputs and fewer repeats")
+    parser.add_argument('--latency-ms', type=float, default=5, help="Fake X API latency for the cycle benchmark")
+    parser.add_argument('--triggers', type=int, default=20, help="Trigger tweets per cycle for the cycle benchmark")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    # Everything runs in a scratch directory with its own database and log file
+    workdir = tempfile.mkdtemp(prefix='rugguard-bench-')
+    os.chdir(workdir)
+
+    # The fake X API must be configured before project modules read config.py
+    from fake_x_api import start_fake_server, SyntheticData
+    server = start_fake_server(
+        data=SyntheticData(seed=42, triggers_per_search=args.triggers),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 4
+    )
+    os.environ['X_API_BASE_URL'] = server.base_url
+
+    sys.path.insert(0, os.path.join(BOT_DIR, 'scripts'))
+    from setup_database import setup_database
+    setup_database()
+
+    results = {}
+    bench_perform_analysis(results, args.quick)
+    bench_check_trusted_followers(results, args.quick)
+    bench_spam_patterns(results, args.quick)
+    bench_near_duplicates(results, args.quick)
+    bench_batch_scoring(results, args.quick)
+    bench_text_matching(results, args.quick)
+    bench_scam_network(results, args.quick)
+    bench_monitoring_cycle(results, args.quick, server)
+    server.shutdown()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick
+        },
+        'results': results
+    }
+
+    for name, stats in results.items():
+        print(f"{name:70s} median {stats['median'] * 1000:10.3f} ms")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print("No baseline found; run with --save-baseline to create one")
+        return 0
+
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f"❌ REGRESSION {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms")
+    if not regressions:
+        print("✅ No regressions against baseline")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,42 @@
+import json
 import logging
 import time
-import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from x_api_client import XAPIClient
 from analyzer import AccountAnalyzer
+from storage import get_storage
+from processed_tweets import ProcessedTweetTracker
+from stats import BotStats
+from maintenance import DatabaseMaintenance
+from migrations import migrate
+from metrics import CYCLE_DURATION, TRIGGERS_PROCESSED, time_stage
 from config import *
 
 class RugguardBot:
     def __init__(self):
         self.setup_logging()
+        migrate(DATABASE_PATH)
         self.x_client = XAPIClient()
         self.analyzer = AccountAnalyzer(self.x_client)
         self.db_path = DATABASE_PATH
-        self.last_search_id = None
+        self.storage = get_storage(self.db_path)
+        self.processed_tweets = ProcessedTweetTracker(self.db_path)
+        self.processed_tweets.warm()
+        self.stats = BotStats(self.db_path)
+        self.maintenance = DatabaseMaintenance(self.db_path)
+        # One long-lived pool, so worker threads and their database connections are reused across cycles
+        self.trigger_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_TRIGGERS,
+            thread_name_prefix='trigger'
+        )
+        self.last_search_id = self.get_state('last_search_id')
+        # Set while a capped search left older mentions unread; see _next_search_cursor
+        self.search_until_id = self.get_state('search_until_id') or None
+        self.search_newest_id = self.get_state('search_newest_id') or None
+        self.pending_search = None
+        # Trigger id -> failed attempts; the cursor stays below these so the next search fetches them again
+        self.failed_triggers = json.loads(self.get_state('failed_triggers') or '{}')
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -29,36 +53,14 @@ class RugguardBot:
     def get_bot_status(self):
         """Get current bot status and statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get processing statistics
-            cursor.execute("SELECT COUNT(*) FROM processed_tweets")
-            processed_count = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM analysis_results")
-            analysis_count = cursor.fetchone()[0]
-            
-            # Get recent activity (last 24 hours)
-            cursor.execute("""
-                SELECT COUNT(*) FROM processed_tweets 
-                WHERE processed_date > datetime('now', '-24 hours')
-            """)
-            recent_processed = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM analysis_results 
-                WHERE analysis_date > datetime('now', '-24 hours')
-            """)
-            recent_analysis = cursor.fetchone()[0]
-            
-            conn.close()
+            # Read the counters maintained as tweets are processed and analyses stored
+            summary = self.stats.summary()
             
             return {
-                'total_processed': processed_count,
-                'total_analysis': analysis_count,
-                'recent_processed_24h': recent_processed,
-                'recent_analysis_24h': recent_analysis,
+                'total_processed': summary['total_processed'],
+                'total_analysis': summary['total_analysis'],
+                'recent_processed_24h': summary['recent_processed_24h'],
+                'recent_analysis_24h': summary['recent_analysis_24h'],
                 'last_check': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
@@ -79,46 +81,72 @@ class RugguardBot:
             self.logger.info(f" Last Status Check: {status['last_check']}")
             self.logger.info("=" * 50)
     
-    def is_tweet_processed(self, tweet_id):
-        """Check if tweet has already been processed"""
+    def filter_unprocessed_tweets(self, tweets):
+        """Drop tweets that have already been processed, checking the whole batch at once"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM processed_tweets WHERE tweet_id = ?", (tweet_id,))
-            result = cursor.fetchone()
-            conn.close()
-            return result is not None
+            unprocessed_ids = set(self.processed_tweets.filter_unprocessed(tweet['id'] for tweet in tweets))
+            return [tweet for tweet in tweets if str(tweet['id']) in unprocessed_ids]
         except Exception as e:
-            self.logger.error(f"Error checking processed tweet: {e}")
-            return False
+            self.logger.error(f"Error checking processed tweets: {e}")
+            return tweets
     
     def mark_tweet_processed(self, tweet_id):
-        """Mark tweet as processed"""
+        """Mark tweet as processed, writing it at once so a restart never replies to it twice"""
+        self.processed_tweets.mark_processed([tweet_id])
+        self.flush_processed_tweets()
+    
+    def flush_processed_tweets(self):
+        """Persist tweets marked as processed; ids whose write failed stay queued for the next flush"""
+        try:
+            self.processed_tweets.flush()
+        except Exception as e:
+            self.logger.error(f"Error marking tweets as processed: {e}")
+    
+    def get_state(self, key):
+        """Read a persisted bot state value"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO processed_tweets (tweet_id) VALUES (?)",
-                (tweet_id,)
+            return self.storage.fetchvalue("SELECT value FROM bot_state WHERE key = ?", (key,))
+        except Exception as e:
+            self.logger.error(f"Error reading bot state {key}: {e}")
+            return None
+    
+    def set_state(self, key, value):
+        """Persist a bot state value"""
+        try:
+            self.storage.execute(
+                "INSERT OR REPLACE INTO bot_state (key, value, updated_date) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                (key, str(value))
             )
-            conn.commit()
-            conn.close()
         except Exception as e:
-            self.logger.error(f"Error marking tweet as processed: {e}")
+            self.logger.error(f"Error saving bot state {key}: {e}")
     
     def find_trigger_tweets(self):
         """Find tweets containing the trigger phrase"""
         try:
-            # Search for mentions of the trigger phrase
+            # Search for mentions of the trigger phrase newer than the last cursor
             query = f'"{TRIGGER_PHRASE}" -is:retweet'
-            tweets = self.x_client.search_mentions(query, max_results=10)
+            if self.last_search_id:
+                if self.search_until_id:
+                    self.logger.info(f"Catching up on mentions older than {self.search_until_id}")
+                tweets, complete = self.x_client.search_mentions(
+                    query,
+                    max_results=SEARCH_PAGE_SIZE,
+                    since_id=self.last_search_id,
+                    until_id=self.search_until_id,
+                    max_pages=SEARCH_MAX_PAGES
+                )
+            else:
+                # First run: only look at the latest page instead of the whole search window
+                tweets, _ = self.x_client.search_mentions(query, max_results=10)
+                complete = True
+            
+            # An empty but complete catch-up search still closes the gap
+            if tweets or (complete and self.search_until_id):
+                self.pending_search = self._next_search_cursor(tweets, complete)
             
             trigger_tweets = []
-            for tweet in tweets:
-                # Skip if already processed
-                if self.is_tweet_processed(tweet['id']):
-                    continue
-                
+            # Skip tweets that were already processed
+            for tweet in self.filter_unprocessed_tweets(tweets):
                 # Check if it's a reply and contains trigger phrase
                 if TRIGGER_PHRASE.lower() in tweet['text'].lower():
                     trigger_tweets.append(tweet)
@@ -129,6 +157,26 @@ class RugguardBot:
             self.logger.error(f"Error finding trigger tweets: {e}")
             return []
     
+    def _next_search_cursor(self, tweets, complete):
+        """Return (last_search_id, search_until_id, search_newest_id) to save once this batch is handled.
+        Results come newest first, so a search cut short by SEARCH_MAX_PAGES has only its oldest mentions
+        unread: since_id stays put and later cycles page down from the oldest fetched id until the gap closes."""
+        ids = [int(tweet['id']) for tweet in tweets]
+        newest = str(max(ids + [int(self.search_newest_id or 0)]))
+        if complete:
+            return newest, None, None
+        return self.last_search_id, str(min(ids)), newest
+    
+    def record_failed_triggers(self, tweet_ids):
+        """Count a failed attempt for each trigger, dropping those out of attempts"""
+        for tweet_id in tweet_ids:
+            attempts = self.failed_triggers.get(tweet_id, 0) + 1
+            if attempts >= TRIGGER_MAX_ATTEMPTS:
+                self.logger.warning(f"Giving up on trigger tweet {tweet_id} after {attempts} attempts")
+                self.failed_triggers.pop(tweet_id, None)
+            else:
+                self.failed_triggers[tweet_id] = attempts
+    
     def get_original_tweet_author(self, reply_tweet):
         """Get the author of the original tweet being replied to"""
         try:
@@ -136,22 +184,15 @@ class RugguardBot:
             if not reply_tweet.get('referenced_tweets'):
                 return None
             
+            # Prefer the author expanded in the search response
+            if reply_tweet.get('replied_to_author'):
+                return reply_tweet['replied_to_author']
+            
             # Find the replied-to tweet
             for ref in reply_tweet['referenced_tweets']:
                 if ref['type'] == 'replied_to':
-                    # Get the original tweet details
-                    original_tweet = self.x_client.api_v2.get_tweet(
-                        ref['id'],
-                        expansions=['author_id'],
-                        user_fields=['username']
-                    )
-                    
-                    if original_tweet.data and original_tweet.includes.get('users'):
-                        author = original_tweet.includes['users'][0]
-                        return {
-                            'user_id': author.id,
-                            'username': author.username
-                        }
+                    # Fall back to looking up the original tweet
+                    return self.x_client.get_tweet_author(ref['id'])
             
             return None
             
@@ -159,7 +200,24 @@ class RugguardBot:
             self.logger.error(f"Error getting original tweet author: {e}")
             return None
     
-    def process_trigger_tweet(self, trigger_tweet):
+    def prepare_analyses(self, trigger_tweets):
+        """Resolve the authors of a batch of trigger tweets and analyze them together"""
+        usernames = []
+        for tweet in trigger_tweets:
+            # Timed here only; process_trigger_tweet's second lookup is a dict read
+            with time_stage('author_resolve'):
+                author = self.get_original_tweet_author(tweet)
+            if author:
+                # Remember fallback lookups so process_trigger_tweet doesn't repeat them
+                tweet['replied_to_author'] = author
+                usernames.append(author['username'])
+        
+        if not usernames:
+            return {}
+        
+        return self.analyzer.analyze_accounts(usernames)
+    
+    def process_trigger_tweet(self, trigger_tweet, analysis=None):
         """Process a single trigger tweet"""
         try:
             self.logger.info(f"Processing trigger tweet: {trigger_tweet['id']}")
@@ -168,14 +226,17 @@ class RugguardBot:
             original_author = self.get_original_tweet_author(trigger_tweet)
             if not original_author:
                 self.logger.warning("Could not find original tweet author")
+                TRIGGERS_PROCESSED.inc(outcome='no_author')
                 return False
             
             self.logger.info(f"Analyzing account: @{original_author['username']}")
             
-            # Analyze the original author's account
-            analysis = self.analyzer.analyze_account(original_author['username'])
+            # Analyze the original author's account unless it was prepared in bulk
+            if analysis is None:
+                analysis = self.analyzer.analyze_account(original_author['username'])
             if not analysis:
                 self.logger.error("Analysis failed")
+                TRIGGERS_PROCESSED.inc(outcome='analysis_failed')
                 return False
             
             # Format and post reply
@@ -185,17 +246,32 @@ class RugguardBot:
             if reply_id:
                 self.logger.info(f"Successfully posted analysis reply: {reply_id}")
                 self.mark_tweet_processed(trigger_tweet['id'])
+                TRIGGERS_PROCESSED.inc(outcome='replied')
                 return True
             else:
                 self.logger.error("Failed to post reply")
+                TRIGGERS_PROCESSED.inc(outcome='reply_failed')
                 return False
                 
         except Exception as e:
             self.logger.error(f"Error processing trigger tweet: {e}")
+            TRIGGERS_PROCESSED.inc(outcome='error')
             return False
     
+    def _analysis_for(self, trigger_tweet, analyses):
+        """Look up the prepared analysis for a trigger tweet's author"""
+        author = trigger_tweet.get('replied_to_author')
+        if not author:
+            return None
+        return analyses.get(author['username'].lower())
+    
     def run_monitoring_cycle(self):
         """Run one monitoring cycle"""
+        with CYCLE_DURATION.time():
+            self._run_monitoring_cycle()
+    
+    def _run_monitoring_cycle(self):
+        """Search for triggers, analyze their authors and post replies"""
         try:
             self.logger.info("🔄 Starting monitoring cycle...")
             
@@ -208,6 +284,7 @@ class RugguardBot:
                 self.log_status()
             
             # Find trigger tweets
+            self.pending_search = None
             trigger_tweets = self.find_trigger_tweets()
             
             if trigger_tweets:
@@ -215,20 +292,52 @@ class RugguardBot:
             else:
                 self.logger.info("👀 No new trigger tweets found")
             
-            # Process each trigger tweet
+            # Analyze every author in this batch with bulk profile lookups
+            analyses = self.prepare_analyses(trigger_tweets) if trigger_tweets else {}
+            
+            # Process trigger tweets concurrently, bounded by MAX_CONCURRENT_TRIGGERS
             processed_count = 0
-            for tweet in trigger_tweets:
-                try:
-                    if self.process_trigger_tweet(tweet):
+            failed = []
+            if trigger_tweets:
+                futures = {
+                    self.trigger_executor.submit(
+                        self.process_trigger_tweet, tweet, self._analysis_for(tweet, analyses)
+                    ): tweet
+                    for tweet in trigger_tweets
+                }
+                for future in as_completed(futures):
+                    tweet = futures[future]
+                    try:
+                        replied = future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ Error processing tweet {tweet['id']}: {e}")
+                        replied = False
+                    
+                    if replied:
                         processed_count += 1
-                    # Add delay between processing to avoid rate limits
-                    time.sleep(5)
-                except Exception as e:
-                    self.logger.error(f"❌ Error processing tweet {tweet['id']}: {e}")
-                    continue
+                        self.failed_triggers.pop(str(tweet['id']), None)
+                    elif tweet.get('replied_to_author'):
+                        # The author was found, so the analysis or the reply failed; retry next cycle
+                        failed.append(str(tweet['id']))
             
             if processed_count > 0:
                 self.logger.info(f"✅ Successfully processed {processed_count} tweets")
+            # Replies write their ids as they succeed; this retries any write that failed
+            self.flush_processed_tweets()
+            self.record_failed_triggers(failed)
+            
+            # Advance the search cursor once this batch has been handled
+            if self.pending_search:
+                last_search_id, self.search_until_id, self.search_newest_id = self.pending_search
+                if self.failed_triggers:
+                    oldest_failed = min(int(tweet_id) for tweet_id in self.failed_triggers)
+                    last_search_id = str(min(int(last_search_id), oldest_failed - 1))
+                self.last_search_id = last_search_id
+                self.set_state('last_search_id', self.last_search_id)
+                self.set_state('search_until_id', self.search_until_id or '')
+                self.set_state('search_newest_id', self.search_newest_id or '')
+                self.set_state('failed_triggers', json.dumps(self.failed_triggers))
+                self.pending_search = None
             
             self.logger.info("✨ Monitoring cycle completed")
             
@@ -244,6 +353,12 @@ class RugguardBot:
         # Log initial status
         self.log_status()
         
+        # Prune old rows in the background so the database stays a steady size
+        self.maintenance.start()
+        
+        # Keep the index of who trusted accounts follow up to date for trusted follower checks
+        self.analyzer.trusted_graph.start()
+        
         cycle_count = 0
         while True:
             try:
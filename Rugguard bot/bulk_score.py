@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Bulk scorer for RUGGUARD Bot
+Streams usernames from a file or stdin and writes one JSON analysis per line
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import time
+from itertools import islice
+from x_api_client import XAPIClient
+from analyzer import AccountAnalyzer
+from rate_limiter import PRIORITY_HIGH, PRIORITY_LOW
+from migrations import migrate
+from config import USER_LOOKUP_BATCH_SIZE, FOLLOWER_MAX_PAGES
+
+# (endpoint, priority, calls per account) whose budgets decide how many accounts go into each batch;
+# the follower scan may spend up to FOLLOWER_MAX_PAGES calls
+BUDGET_ENDPOINTS = [
+    ('get_users_tweets', PRIORITY_HIGH, 1),
+    ('get_users_followers', PRIORITY_LOW, FOLLOWER_MAX_PAGES)
+]
+
+# Low-priority calls also take a token from the hourly budget
+HOURLY_CALLS_PER_ACCOUNT = sum(calls for _, priority, calls in BUDGET_ENDPOINTS if priority == PRIORITY_LOW)
+
+class BulkScorer:
+    def __init__(self, analyzer, x_client, batch_size=USER_LOOKUP_BATCH_SIZE):
+        self.analyzer = analyzer
+        self.x_client = x_client
+        self.batch_size = batch_size
+        self.limits_probed = False
+        self.logger = logging.getLogger(__name__)
+
+    def next_batch_size(self):
+        """Size the next batch to the rate-limit budget, waiting until at least one account fits"""
+        while True:
+            # Endpoint limits are only learned from response headers, so the first batch is a single account
+            sizes = [self.batch_size if self.limits_probed else 1]
+            for endpoint, priority, calls in BUDGET_ENDPOINTS:
+                budget = self.x_client.available_calls(endpoint, priority)
+                if budget is not None:
+                    sizes.append(budget // calls)
+
+            budget = self.x_client.available_calls(None, PRIORITY_LOW)
+            if budget is not None:
+                sizes.append(budget // HOURLY_CALLS_PER_ACCOUNT)
+
+            size = min(sizes)
+            if size > 0:
+                self.limits_probed = True
+                return size
+
+            waits = [
+                self.x_client.time_until_available(endpoint, priority, calls)
+                for endpoint, priority, calls in BUDGET_ENDPOINTS
+            ]
+            waits.append(self.x_client.time_until_available(None, PRIORITY_LOW, HOURLY_CALLS_PER_ACCOUNT))
+            wait = max(waits)
+            self.logger.info(f"Rate-limit budget exhausted, waiting {wait:.0f}s")
+            time.sleep(max(wait, 1))
+
+    def score(self, usernames, output, checkpoint=None, skip=0):
+        """Score a stream of usernames, writing JSON lines and checkpointing after each batch"""
+        usernames = iter(usernames)
+        done = skip
+        scored = 0
+
+        while True:
+            batch = list(islice(usernames, self.next_batch_size()))
+            if not batch:
+                break
+
+            analyses = self.analyzer.analyze_accounts(batch)
+            for username in batch:
+                analysis = analyses.get(username.lstrip('@').lower())
+                output.write(json.dumps(format_result(username, analysis)) + '\n')
+                scored += analysis is not None
+            output.flush()
+
+            done += len(batch)
+            if checkpoint:
+                save_checkpoint(checkpoint, done)
+            self.logger.info(f"Scored {done} usernames ({scored} this run)")
+
+        return done
+
+def format_result(username, analysis):
+    """Build the JSON record for one username"""
+    if not analysis:
+        return {'username': username.lstrip('@'), 'error': 'Unable to analyze account'}
+
+    result = dict(analysis)
+    # Tweet fingerprints are stored for near-duplicate detection, not reported
+    result.pop('tweet_fingerprints', None)
+    # JSON has no infinity; accounts following nobody have no ratio
+    if isinstance(result.get('follower_ratio'), float) and math.isinf(result['follower_ratio']):
+        result['follower_ratio'] = None
+    result['user_id'] = str(result['user_id'])
+    return result
+
+def read_usernames(stream, skip=0):
+    """Yield usernames one per line, skipping blanks and comments, after the first `skip` entries"""
+    seen = 0
+    for line in stream:
+        username = line.strip()
+        if not username or username.startswith('#'):
+            continue
+        seen += 1
+        if seen > skip:
+            yield username
+
+def load_checkpoint(path):
+    """Read how many usernames a previous run completed"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, 'r') as f:
+        return json.load(f).get('completed', 0)
+
+def save_checkpoint(path, completed):
+    """Atomically record how many usernames have been written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'completed': completed}, f)
+    os.replace(tmp_path, path)
+
+def main():
+    """Main bulk scoring entry point"""
+    parser = argparse.ArgumentParser(description="Score X accounts in bulk with the RUGGUARD analyzer")
+    parser.add_argument('input', nargs='?', default='-', help="File with one username per line, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file, or - for stdout")
+    parser.add_argument('--checkpoint', help="Checkpoint file used to resume an interrupted run")
+    parser.add_argument('--batch-size', type=int, default=USER_LOOKUP_BATCH_SIZE,
+                        help="Maximum usernames per profile lookup (1-100)")
+    args = parser.parse_args()
+
+    # Logs go to stderr so stdout can carry the results
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    skip = load_checkpoint(args.checkpoint)
+    if skip:
+        logging.info(f"Resuming after {skip} usernames from {args.checkpoint}")
+
+    input_stream = sys.stdin if args.input == '-' else open(args.input, 'r')
+    # Append when resuming so earlier results are kept
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'a' if skip else 'w')
+
+    try:
+        migrate()
+        x_client = XAPIClient()
+        scorer = BulkScorer(AccountAnalyzer(x_client), x_client, max(1, min(args.batch_size, USER_LOOKUP_BATCH_SIZE)))
+        total = scorer.score(read_usernames(input_stream, skip), output_stream, args.checkpoint, skip)
+        logging.info(f"Finished scoring {total} usernames")
+
+    except KeyboardInterrupt:
+        logging.info("Interrupted; rerun with the same --checkpoint to resume")
+        sys.exit(130)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+if __name__ == "__main__":
+    main()
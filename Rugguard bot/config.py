@@ -10,11 +10,32 @@ X_ACCESS_TOKEN = os.getenv('X_ACCESS_TOKEN')
 X_ACCESS_TOKEN_SECRET = os.getenv('X_ACCESS_TOKEN_SECRET')
 X_BEARER_TOKEN = os.getenv('X_BEARER_TOKEN')
 
+# Alternate X API transports for offline testing (see x_transport.py)
+X_API_BASE_URL = os.getenv('X_API_BASE_URL')  # e.g. http://localhost:8090 for fake_x_api.py
+X_API_FIXTURES_DIR = os.getenv('X_API_FIXTURES_DIR')  # Replay recorded responses
+X_API_RECORD_DIR = os.getenv('X_API_RECORD_DIR')  # Record responses as fixtures
+
+if X_API_BASE_URL or X_API_FIXTURES_DIR:
+    # Offline transports ignore credentials, but request signing still needs values
+    X_API_KEY = X_API_KEY or 'offline'
+    X_API_SECRET = X_API_SECRET or 'offline'
+    X_ACCESS_TOKEN = X_ACCESS_TOKEN or 'offline'
+    X_ACCESS_TOKEN_SECRET = X_ACCESS_TOKEN_SECRET or 'offline'
+    X_BEARER_TOKEN = X_BEARER_TOKEN or 'offline'
+
 # Bot Configuration
 TRIGGER_PHRASE = "riddle me this"
 MONITOR_ACCOUNT = "@projectrugguard"  # Optional: monitor specific account
+SEARCH_PAGE_SIZE = 100  # Results per search page (10-100)
+SEARCH_MAX_PAGES = 10  # Pages followed per cycle when catching up from since_id
+USER_LOOKUP_BATCH_SIZE = 100  # Usernames per get_users request (API maximum is 100)
+TRIGGER_MAX_ATTEMPTS = 3  # Cycles a trigger whose analysis or reply failed is tried before it is dropped
 TRUSTED_ACCOUNTS_URL = "https://raw.githubusercontent.com/devsyrem/turst-list/main/list"
 
+# Health Check Server (0 disables the in-process server started by main.py)
+HEALTH_CHECK_PORT = int(os.getenv('HEALTH_CHECK_PORT', '0'))
+STATUS_REFRESH_SECONDS = 15  # How often /status statistics are recomputed in the background
+
 # Database Configuration
 DATABASE_PATH = "rugguard_bot.db"
 
@@ -24,6 +45,71 @@ MIN_ACCOUNT_AGE_DAYS = 30
 GOOD_FOLLOWER_RATIO_THRESHOLD = 0.1
 MAX_FOLLOWING_RATIO = 10.0
 
+# Text Matching (case-insensitive substrings, reported in list order)
+BIO_KEYWORDS = [
+    'crypto', 'blockchain', 'solana', 'defi', 'nft', 'web3',
+    'bitcoin', 'ethereum', 'trading', 'investor', 'developer',
+    'founder', 'ceo', 'project', 'token', 'dapp'
+]
+PROMO_TERMS = ['buy', 'sell', 'pump', 'moon', 'gem', 'x100']
+
+# Near-Duplicate Detection
+SIMHASH_SHINGLE_SIZE = 3  # Characters per shingle in tweet fingerprints
+SIMHASH_NEAR_DUP_DISTANCE = 8  # Max differing bits for near-duplicate tweets
+SIMHASH_BANDS = 9  # LSH bands per fingerprint; more than SIMHASH_NEAR_DUP_DISTANCE so no pair is missed
+
+# Scam Network Index (copy-paste content shared with earlier high-risk accounts)
+SCAM_NETWORK_MAX_DISTANCE = 3  # Max differing bits for a copy; below the 4 indexed bands so none is missed
+SCAM_NETWORK_RISK_SCORE = 40  # Accounts scored below this (HIGH RISK) count as part of a network
+SCAM_NETWORK_MIN_TEXT_LENGTH = 20  # Shorter tweets ("gm", "thanks!") are too common to index
+
 # Rate Limiting
 ANALYSIS_COOLDOWN_HOURS = 24
-MAX_REQUESTS_PER_HOUR = 100
+MAX_REQUESTS_PER_HOUR = 100  # Cap on low-priority calls (follower scans, trusted graph sync); replies are never held by it
+LOW_PRIORITY_RESERVE = 0.2  # Share of each endpoint's budget kept back from low-priority calls
+RATE_LIMIT_MAX_WAIT_SECONDS = 10  # Longest a high-priority call waits before failing; triggers are retried next cycle
+
+# Concurrency
+MAX_CONCURRENT_TRIGGERS = 4  # Trigger tweets processed in parallel per cycle
+ANALYSIS_FETCH_WORKERS = 8  # Threads for parallel X API fetches during analysis
+
+# Analysis Cache
+ANALYSIS_CACHE_SIZE = 1000  # In-process LRU entries in front of analysis_results
+PARTIAL_ANALYSIS_CACHE_MINUTES = 15  # Reuse of analyses whose follower scan was cut off by the rate limit
+
+# Trusted Accounts
+TRUSTED_ACCOUNTS_REFRESH_SECONDS = 600  # How long the in-memory trusted set is reused
+TRUSTED_ACCOUNTS_CHECK_HOURS = 24  # How often the list URL is re-checked (usually a cheap 304)
+TRUSTED_ACCOUNTS_BACKUP_PATH = "trusted_accounts_last_good.txt"  # Last fetched list, used if GitHub is unreachable
+TRUSTED_FOLLOWERS_TARGET = 3  # Follower paging stops once this many are found (the top scoring tier)
+FOLLOWER_PAGE_SIZE = 1000  # Followers per get_users_followers request (API maximum is 1000)
+FOLLOWER_MAX_PAGES = 3  # Follower requests spent per analysis at most
+
+# Trusted Graph Index (who each trusted account follows, synced in the background)
+TRUSTED_GRAPH_SYNC_INTERVAL_SECONDS = 900  # How often the background sync wakes up
+TRUSTED_GRAPH_REFRESH_HOURS = 24  # A trusted account's following list is re-synced after this long
+TRUSTED_GRAPH_ACCOUNTS_PER_RUN = 3  # Trusted accounts synced per wake-up, spreading API use out
+FOLLOWING_PAGE_SIZE = 1000  # Accounts per get_users_following request (API maximum is 1000)
+TRUSTED_GRAPH_MAX_PAGES = 5  # get_users_following requests per trusted account at most
+
+# SQLite Tuning
+SQLITE_BUSY_TIMEOUT_MS = 5000  # How long a connection waits on a locked database
+SQLITE_CACHE_SIZE_KB = 8192  # Page cache per connection
+SQLITE_STATEMENT_CACHE_SIZE = 128  # Prepared statements kept per connection
+
+# Processed Tweet Dedup
+RECENT_PROCESSED_IDS_SIZE = 10000  # Recently processed tweet ids kept in memory
+
+# Offline Rescoring
+RESCORE_CHUNK_SIZE = 5000  # Stored analyses read and rewritten per transaction by rescore.py
+
+# Retention and Maintenance
+PROCESSED_TWEETS_RETENTION_DAYS = 30  # Dedup only needs ids newer than the search window (7 days)
+ANALYSIS_RESULTS_RETENTION_DAYS = 90  # Older analyses are re-fetched on demand
+ANALYSIS_HISTORY_RETENTION_DAYS = 365  # Score history kept per account
+TWEET_FINGERPRINTS_RETENTION_DAYS = 90  # Stored SimHash fingerprints of analyzed tweets
+STATS_HOURLY_RETENTION_DAYS = 30  # Hourly statistics buckets; totals in bot_stats are kept
+MAINTENANCE_INTERVAL_SECONDS = 3600  # How often the background pruning job runs
+MAINTENANCE_BATCH_SIZE = 1000  # Rows deleted per short write transaction
+MAINTENANCE_BATCH_PAUSE_SECONDS = 0.05  # Pause between batches so bot writes are not starved
+MAINTENANCE_VACUUM_PAGES = 2000  # Free pages returned to the OS per incremental vacuum
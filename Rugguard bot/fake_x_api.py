@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the X API used by RUGGUARD Bot
+Serves synthetic v2 data with configurable latency and rate limits for load testing
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Requests allowed per rate-limit window, matching the X API v2 defaults
+DEFAULT_RATE_LIMITS = {
+    'search_recent_tweets': 450,
+    'get_user': 900,
+    'get_users': 900,
+    'get_users_tweets': 1500,
+    'get_users_followers': 15,
+    'get_users_following': 15,
+    'get_tweet': 900,
+    'create_tweet': 200,
+    'verify_credentials': 75
+}
+
+TWEET_TEMPLATES = [
+    "Building on Solana every day, shipping new features for the community",
+    "GM! Great AMA today, thanks everyone who joined",
+    "Just published our audit report, link in bio",
+    "Buy now before it's too late, this gem will moon x100",
+    "Huge pump incoming, don't miss the next 100x gem",
+    "Thread on how we designed our token economics",
+    "Sell pressure is gone, send it to the moon",
+    "Reading through the latest Solana validator docs",
+    "Airdrop live now, connect your wallet to claim",
+    "Our devs just merged the new staking contract"
+]
+
+BIO_TEMPLATES = [
+    "Founder building DeFi on Solana. Previously blockchain developer at a web3 startup.",
+    "Crypto investor and NFT collector",
+    "100x gems daily",
+    "",
+    "Solana developer, dapp builder, token engineering nerd. Opinions are my own.",
+    "Trading signals and alpha calls. Not financial advice."
+]
+
+def _format_time(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+def _stable_int(value, modulus=10 ** 15):
+    return zlib.crc32(value.encode()) * 1000003 % modulus + 10 ** 14
+
+class SyntheticData:
+    """Deterministic synthetic users, tweets and follower graphs"""
+
+    def __init__(self, seed=0, trusted_accounts=None, author_pool_size=50,
+                 triggers_per_search=5, trusted_follow_probability=0.02):
+        self.seed = seed
+        self.trusted_accounts = list(trusted_accounts or [f"trusted{i}" for i in range(100)])
+        self.author_pool = [f"author{i}" for i in range(author_pool_size)]
+        self.triggers_per_search = triggers_per_search
+        self.trusted_follow_probability = trusted_follow_probability
+        self.now = datetime.now(timezone.utc)
+        self.lock = threading.Lock()
+        self.usernames_by_id = {}
+        self.tweets = {}  # Original tweets referenced by triggers
+        self.triggers = []  # Trigger tweets, oldest first
+        self.next_tweet_id = 10 ** 18
+        self.replies_posted = 0
+
+    def _rng(self, *parts):
+        return random.Random(f"{self.seed}:" + ':'.join(str(p) for p in parts))
+
+    def user(self, username):
+        """Profile for a username; names starting with 'missing' do not exist"""
+        if username.lower().startswith('missing'):
+            return None
+
+        user_id = str(_stable_int(username.lower()))
+        self.usernames_by_id[user_id] = username
+        rng = self._rng('user', username.lower())
+        followers = int(rng.lognormvariate(6, 2))
+        return {
+            'id': user_id,
+            'username': username,
+            'name': username.title(),
+            'created_at': _format_time(self.now - timedelta(days=rng.randint(1, 3000))),
+            'description': rng.choice(BIO_TEMPLATES),
+            'verified': rng.random() < 0.05,
+            'public_metrics': {
+                'followers_count': followers,
+                'following_count': int(rng.lognormvariate(5, 1.5)),
+                'tweet_count': rng.randint(0, 20000),
+                'listed_count': rng.randint(0, 50)
+            }
+        }
+
+    def username_for_id(self, user_id):
+        return self.usernames_by_id.get(user_id, f"user{user_id}")
+
+    def user_tweets(self, user_id, count):
+        """Recent tweets for a user"""
+        rng = self._rng('tweets', user_id)
+        tweets = []
+        for i in range(count):
+            tweet_id = str(_stable_int(f"{user_id}:{i}", 10 ** 17) + 10 ** 17)
+            tweets.append({
+                'id': tweet_id,
+                'edit_history_tweet_ids': [tweet_id],
+                'text': f"{rng.choice(TWEET_TEMPLATES)} {rng.choice(['', '', 'https://t.co/' + str(rng.randint(0, 99))])}".strip(),
+                'author_id': user_id,
+                'created_at': _format_time(self.now - timedelta(hours=i * rng.randint(1, 48))),
+                'public_metrics': {
+                    'retweet_count': int(rng.expovariate(0.3)),
+                    'like_count': int(rng.expovariate(0.05)),
+                    'reply_count': int(rng.expovariate(0.5)),
+                    'quote_count': int(rng.expovariate(1.0))
+                }
+            })
+        return tweets
+
+    def follow_page(self, user_id, kind, page, page_size):
+        """One page of followers or following for a user, with trusted accounts mixed in"""
+        username = self.username_for_id(user_id)
+        profile = self.user(username) or {'public_metrics': {'followers_count': 0, 'following_count': 0}}
+        total = profile['public_metrics'][f"{kind}_count"]
+        start = page * page_size
+        rng = self._rng(kind, user_id, page)
+
+        users = []
+        for i in range(start, min(total, start + page_size)):
+            if rng.random() < self.trusted_follow_probability:
+                name = rng.choice(self.trusted_accounts)
+            else:
+                name = f"fan{_stable_int(f'{user_id}:{kind}:{i}') % 10 ** 8}"
+            users.append({'id': str(_stable_int(name.lower())), 'username': name, 'name': name})
+
+        has_more = start + page_size < total
+        return users, (str(page + 1) if has_more else None)
+
+    def new_triggers(self):
+        """Generate the trigger replies that arrived since the last search"""
+        with self.lock:
+            rng = self._rng('triggers', len(self.triggers))
+            for _ in range(self.triggers_per_search):
+                author = self.user(rng.choice(self.author_pool))
+                original_id = str(self.next_tweet_id)
+                trigger_id = str(self.next_tweet_id + 1)
+                self.next_tweet_id += 2
+
+                self.tweets[original_id] = {
+                    'id': original_id,
+                    'edit_history_tweet_ids': [original_id],
+                    'text': rng.choice(TWEET_TEMPLATES),
+                    'author_id': author['id'],
+                    'created_at': _format_time(datetime.now(timezone.utc))
+                }
+                replier = self.user(f"replier{rng.randint(0, 10 ** 6)}")
+                self.triggers.append({
+                    'id': trigger_id,
+                    'edit_history_tweet_ids': [trigger_id],
+                    'text': f"@{author['username']} riddle me this",
+                    'author_id': replier['id'],
+                    'created_at': _format_time(datetime.now(timezone.utc)),
+                    'in_reply_to_user_id': author['id'],
+                    'referenced_tweets': [{'type': 'replied_to', 'id': original_id}]
+                })
+
+    def search(self, since_id, page_size, token, until_id=None):
+        """Trigger tweets newer than since_id and older than until_id, newest first"""
+        # New triggers arrive between searches, not while paging through one
+        if not token:
+            self.new_triggers()
+        with self.lock:
+            matches = [
+                t for t in reversed(self.triggers)
+                if (not since_id or int(t['id']) > int(since_id)) and (not until_id or int(t['id']) < int(until_id))
+            ]
+        if not since_id:
+            matches = matches[:page_size]
+
+        start = int(token or 0)
+        page = matches[start:start + page_size]
+        next_token = str(start + page_size) if start + page_size < len(matches) else None
+        return page, next_token
+
+    def post_reply(self, text):
+        with self.lock:
+            self.replies_posted += 1
+            tweet_id = str(self.next_tweet_id)
+            self.next_tweet_id += 1
+        return {'id': tweet_id, 'text': text, 'edit_history_tweet_ids': [tweet_id]}
+
+class RateLimitWindow:
+    """Fixed-window request counter per endpoint"""
+
+    def __init__(self, limits, window_seconds):
+        self.limits = limits
+        self.window_seconds = window_seconds
+        self.windows = {}
+        self.lock = threading.Lock()
+
+    def hit(self, endpoint):
+        """Count a request; returns (allowed, headers)"""
+        limit = self.limits.get(endpoint, 900)
+        now = time.time()
+        with self.lock:
+            reset_at, used = self.windows.get(endpoint, (now + self.window_seconds, 0))
+            if now >= reset_at:
+                reset_at, used = now + self.window_seconds, 0
+            allowed = used < limit
+            if allowed:
+                used += 1
+            self.windows[endpoint] = (reset_at, used)
+
+        headers = {
+            'x-rate-limit-limit': str(limit),
+            'x-rate-limit-remaining': str(limit - used),
+            'x-rate-limit-reset': str(int(reset_at))
+        }
+        return allowed, headers
+
+class FakeXAPIHandler(BaseHTTPRequestHandler):
+    """Routes X API v2 (and v1.1 verify_credentials) requests to the synthetic data"""
+
+    routes = [
+        ('GET', r'^/2/tweets/search/recent$', 'search_recent_tweets'),
+        ('GET', r'^/2/users/by/username/(?P<username>[^/]+)$', 'get_user'),
+        ('GET', r'^/2/users/by$', 'get_users'),
+        ('GET', r'^/2/users/(?P<id>\d+)/tweets$', 'get_users_tweets'),
+        ('GET', r'^/2/users/(?P<id>\d+)/followers$', 'get_users_followers'),
+        ('GET', r'^/2/users/(?P<id>\d+)/following$', 'get_users_following'),
+        ('GET', r'^/2/tweets/(?P<id>\d+)$', 'get_tweet'),
+        ('POST', r'^/2/tweets$', 'create_tweet'),
+        ('GET', r'^/1\.1/account/verify_credentials\.json$', 'verify_credentials')
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        for route_method, pattern, endpoint in self.routes:
+            match = re.match(pattern, url.path)
+            if route_method == method and match:
+                break
+        else:
+            self.send_json(404, {'title': 'Not Found Error', 'detail': url.path})
+            return
+
+        server = self.server
+        if server.latency_ms or server.jitter_ms:
+            time.sleep(max(0.0, random.gauss(server.latency_ms, server.jitter_ms)) / 1000)
+
+        allowed, headers = server.rate_limits.hit(endpoint)
+        if not allowed:
+            self.send_json(429, {'title': 'Too Many Requests', 'status': 429}, headers)
+            return
+
+        body = None
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+
+        with server.counts_lock:
+            server.request_counts[endpoint] = server.request_counts.get(endpoint, 0) + 1
+        status, payload = getattr(self, f"handle_{endpoint}")(params, body, **match.groupdict())
+        self.send_json(status, payload, headers)
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_search_recent_tweets(self, params, body):
+        data = self.server.data
+        tweets, next_token = data.search(
+            params.get('since_id'), int(params.get('max_results', 10)), params.get('next_token'), params.get('until_id')
+        )
+
+        users = {}
+        referenced = []
+        for tweet in tweets:
+            users[tweet['author_id']] = data.user(data.username_for_id(tweet['author_id']))
+            for ref in tweet.get('referenced_tweets', []):
+                original = data.tweets.get(ref['id'])
+                if original:
+                    referenced.append(original)
+                    users[original['author_id']] = data.user(data.username_for_id(original['author_id']))
+
+        meta = {'result_count': len(tweets)}
+        if tweets:
+            meta.update(newest_id=tweets[0]['id'], oldest_id=tweets[-1]['id'])
+        if next_token:
+            meta['next_token'] = next_token
+
+        payload = {'meta': meta}
+        if tweets:
+            payload['data'] = tweets
+            payload['includes'] = {'tweets': referenced, 'users': list(users.values())}
+        return 200, payload
+
+    def handle_get_user(self, params, body, username):
+        user = self.server.data.user(username)
+        if user is None:
+            return 200, {'errors': [{'title': 'Not Found Error', 'value': username}]}
+        return 200, {'data': user}
+
+    def handle_get_users(self, params, body):
+        usernames = params.get('usernames', '').split(',')
+        users = [self.server.data.user(name) for name in usernames if name]
+        payload = {'data': [user for user in users if user]}
+        missing = [name for name, user in zip(usernames, users) if user is None]
+        if missing:
+            payload['errors'] = [{'title': 'Not Found Error', 'value': name} for name in missing]
+        return 200, payload
+
+    def handle_get_users_tweets(self, params, body, id):
+        tweets = self.server.data.user_tweets(id, int(params.get('max_results', 10)))
+        return 200, {'data': tweets, 'meta': {'result_count': len(tweets)}}
+
+    def _follow_page(self, params, id, kind):
+        page = int(params.get('pagination_token') or 0)
+        users, next_token = self.server.data.follow_page(id, kind, page, int(params.get('max_results', 100)))
+        meta = {'result_count': len(users)}
+        if next_token:
+            meta['next_token'] = next_token
+        return 200, {'data': users, 'meta': meta}
+
+    def handle_get_users_followers(self, params, body, id):
+        return self._follow_page(params, id, 'followers')
+
+    def handle_get_users_following(self, params, body, id):
+        return self._follow_page(params, id, 'following')
+
+    def handle_get_tweet(self, params, body, id):
+        data = self.server.data
+        tweet = data.tweets.get(id)
+        if tweet is None:
+            return 200, {'errors': [{'title': 'Not Found Error', 'value': id}]}
+        author = data.user(data.username_for_id(tweet['author_id']))
+        return 200, {'data': tweet, 'includes': {'users': [author]}}
+
+    def handle_create_tweet(self, params, body):
+        return 201, {'data': self.server.data.post_reply(body.get('text', ''))}
+
+    def handle_verify_credentials(self, params, body):
+        return 200, {'id': 1, 'id_str': '1', 'screen_name': 'projectrugguard', 'name': 'RUGGUARD'}
+
+class FakeXAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data=None, latency_ms=0, jitter_ms=0,
+                 rate_limits=None, rate_window_seconds=900):
+        super().__init__(address, FakeXAPIHandler)
+        self.data = data or SyntheticData()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limits = RateLimitWindow(rate_limits or DEFAULT_RATE_LIMITS, rate_window_seconds)
+        self.request_counts = {}
+        self.counts_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def start_fake_server(port=0, **options):
+    """Start a fake X API server on a background thread; returns the server"""
+    server = FakeXAPIServer(('127.0.0.1', port), **options)
+    thread = threading.Thread(target=server.serve_forever, name='fake-x-api', daemon=True)
+    thread.start()
+    return server
+
+def main():
+    """Run the fake X API server"""
+    parser = argparse.ArgumentParser(description="Offline stand-in for the X API")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=50, help="Mean response latency")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="Standard deviation of response latency")
+    parser.add_argument('--rate-window', type=float, default=900, help="Rate-limit window in seconds")
+    parser.add_argument('--triggers-per-search', type=int, default=5, help="New trigger tweets per search request")
+    parser.add_argument('--authors', type=int, default=50, help="Distinct authors that trigger tweets reply to")
+    args = parser.parse_args()
+
+    data = SyntheticData(seed=args.seed, author_pool_size=args.authors, triggers_per_search=args.triggers_per_search)
+    server = FakeXAPIServer(('', args.port), data=data, latency_ms=args.latency_ms,
+                            jitter_ms=args.jitter_ms, rate_window_seconds=args.rate_window)
+    print(f"🧪 Fake X API running on port {args.port}")
+    print(f"   Point the bot at it with: X_API_BASE_URL=http://localhost:{args.port}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+
+# Bump when FEATURE_FIELDS changes; decode_features reads every version listed here
+FEATURE_VERSION = 1
+
+# Everything the scoring functions read, in storage order
+FEATURE_FIELDS = (
+    'account_age_days',
+    'follower_count',
+    'following_count',
+    'tweet_count',
+    'verified',
+    'bio_length',
+    'bio_keywords',
+    'avg_engagement',
+    'trusted_followers_count',
+    'spam_indicators'
+)
+
+def follower_ratio(follower_count, following_count):
+    """Followers per followed account, infinite for accounts following nobody"""
+    if following_count > 0:
+        return follower_count / following_count
+    return float('inf')
+
+def encode_features(analysis):
+    """Pack an analysis's scoring inputs into a compact JSON array"""
+    values = [analysis.get(field) for field in FEATURE_FIELDS]
+    values[FEATURE_FIELDS.index('verified')] = int(bool(analysis['verified']))
+    return json.dumps([FEATURE_VERSION] + values, separators=(',', ':'))
+
+def decode_features(blob):
+    """Unpack encode_features output into a dict the scoring functions accept"""
+    values = json.loads(blob)
+    version, values = values[0], values[1:]
+    if version != FEATURE_VERSION:
+        raise ValueError(f"Unsupported feature version {version}")
+
+    features = dict(zip(FEATURE_FIELDS, values))
+    features['verified'] = bool(features['verified'])
+    features['bio_keywords'] = features['bio_keywords'] or []
+    features['spam_indicators'] = features['spam_indicators'] or []
+    features['follower_ratio'] = follower_ratio(features['follower_count'], features['following_count'])
+    return features
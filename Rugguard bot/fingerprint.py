@@ -0,0 +1,131 @@
+"""
+Tweet content fingerprints for RUGGUARD Bot
+64-bit SimHash over character shingles, so texts differing by a character or a link
+land within a few bits of each other, plus LSH banding to find near-duplicates in linear time
+"""
+
+import hashlib
+import re
+from operator import getitem
+from config import SIMHASH_SHINGLE_SIZE, SIMHASH_BANDS, SIMHASH_NEAR_DUP_DISTANCE
+
+SIMHASH_BITS = 64
+
+URL_PATTERN = re.compile(r'https?://\S+')
+MENTION_PATTERN = re.compile(r'@\w+')
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+# Per-bit counters live side by side in one big integer, LANE_BITS wide each, so adding
+# a shingle's spread hash increments all 64 counters with a single addition
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+
+def _spread_byte(value):
+    return sum(1 << (bit * LANE_BITS) for bit in range(8) if value >> bit & 1)
+
+# _SPREAD[j][b] is byte b of a hash at byte position j, spread into its 8 counter lanes
+_SPREAD = [
+    [_spread_byte(value) << (position * 8 * LANE_BITS) for value in range(256)]
+    for position in range(SIMHASH_BITS // 8)
+]
+
+def normalize_text(text):
+    """Lowercase, drop links and mentions and collapse punctuation so trivial edits don't change shingles"""
+    text = MENTION_PATTERN.sub(' ', URL_PATTERN.sub(' ', text.lower()))
+    return NON_WORD_PATTERN.sub(' ', text).strip()
+
+def shingles(text, size=SIMHASH_SHINGLE_SIZE):
+    """Set of overlapping character n-grams of the normalized text"""
+    text = normalize_text(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def simhash(text, size=SIMHASH_SHINGLE_SIZE):
+    """64-bit SimHash of a text; 0 for texts with no content"""
+    features = shingles(text, size)
+    if not features:
+        return 0
+
+    # Each digest byte indexes its position's table; map/sum keep the lookups out of the bytecode loop
+    counters = sum(
+        sum(map(getitem, _SPREAD, hashlib.blake2b(feature.encode(), digest_size=8).digest()))
+        for feature in features
+    )
+
+    # A bit is set when more than half of the shingle hashes have it set
+    half = len(features) / 2
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        if (counters >> (bit * LANE_BITS)) & LANE_MASK > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+def to_signed(fingerprint):
+    """Store a 64-bit fingerprint in SQLite's signed INTEGER"""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+def from_signed(value):
+    return value + (1 << 64) if value < 0 else value
+
+def bands(fingerprint, band_count=SIMHASH_BANDS):
+    """Split a fingerprint into band_count near-equal slices; fingerprints within band_count - 1
+    bits of each other share at least one slice"""
+    width, extra = divmod(SIMHASH_BITS, band_count)
+    slices = []
+    offset = 0
+    for index in range(band_count):
+        size = width + (1 if index < extra else 0)
+        slices.append((fingerprint >> offset) & ((1 << size) - 1))
+        offset += size
+    return slices
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+def near_duplicate_groups(fingerprints, max_distance=SIMHASH_NEAR_DUP_DISTANCE, band_count=SIMHASH_BANDS):
+    """Cluster fingerprints within max_distance bits; returns a group id per fingerprint.
+    Only fingerprints sharing an LSH band are compared, so the cost is linear in practice."""
+    groups = _UnionFind(len(fingerprints))
+    buckets = {}
+    for index, fingerprint in enumerate(fingerprints):
+        for band_index, band in enumerate(bands(fingerprint, band_count)):
+            members = buckets.setdefault((band_index, band), [])
+            for other in members:
+                # Members already joined need no comparison, but later ones may belong to other
+                # groups that this fingerprint bridges, so the whole bucket is scanned
+                if groups.find(other) == groups.find(index):
+                    continue
+                if hamming_distance(fingerprints[other], fingerprint) <= max_distance:
+                    groups.union(other, index)
+            members.append(index)
+    return [groups.find(index) for index in range(len(fingerprints))]
+
+def near_duplicate_ratio(texts, fingerprints=None, max_distance=SIMHASH_NEAR_DUP_DISTANCE):
+    """Share of texts that repeat an earlier one, comparing fingerprints within max_distance bits.
+    Texts with no content once normalized (a lone link or emoji) all fingerprint to 0, so they
+    only repeat an identical raw text."""
+    if not texts:
+        return 0.0
+    if fingerprints is None:
+        fingerprints = [simhash(text) for text in texts]
+
+    with_content = [fingerprint for text, fingerprint in zip(texts, fingerprints) if normalize_text(text)]
+    without_content = {text for text in texts if not normalize_text(text)}
+    distinct = len(set(near_duplicate_groups(with_content, max_distance))) + len(without_content)
+    return 1 - distinct / len(texts)
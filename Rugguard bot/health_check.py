@@ -4,11 +4,81 @@ Simple health check server for RUGGUARD Bot
 Provides a web endpoint to check bot status
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import json
-import sqlite3
+import logging
+import threading
 from datetime import datetime, timedelta
-from config import DATABASE_PATH
+from stats import BotStats
+from metrics import REGISTRY
+from config import DATABASE_PATH, STATUS_REFRESH_SECONDS
+
+class StatusSnapshot:
+    """Bot statistics recomputed on a background thread so status requests never scan the database"""
+    
+    def __init__(self, db_path=DATABASE_PATH, refresh_seconds=STATUS_REFRESH_SECONDS):
+        self.db_path = db_path
+        self.refresh_seconds = refresh_seconds
+        self.logger = logging.getLogger(__name__)
+        self._statistics = None
+        self._refreshed_at = None
+        self._error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def refresh(self):
+        """Recompute the statistics, keeping the previous snapshot if the database is unavailable"""
+        try:
+            summary = BotStats(self.db_path).summary()
+            
+            statistics = {
+                'total_processed': summary['total_processed'],
+                'total_analysis': summary['total_analysis'],
+                'recent_processed_24h': summary['recent_processed_24h'],
+                'recent_analysis_24h': summary['recent_analysis_24h'],
+                'last_activity': summary['last_activity']
+            }
+            with self._lock:
+                self._statistics = statistics
+                self._refreshed_at = datetime.now()
+                self._error = None
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error refreshing status snapshot: {e}")
+            with self._lock:
+                self._error = str(e)
+            return False
+    
+    def get(self):
+        """Return (statistics, refreshed_at, error) from the latest refresh"""
+        with self._lock:
+            return self._statistics, self._refreshed_at, self._error
+    
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+    
+    def start(self):
+        """Take a first snapshot and keep it fresh on a daemon thread"""
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name='status-snapshot', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+
+class HealthCheckServer(ThreadingHTTPServer):
+    """Serves each request on its own thread, sharing one status snapshot"""
+    
+    daemon_threads = True
+    
+    def __init__(self, server_address, handler_class, status_snapshot):
+        super().__init__(server_address, handler_class)
+        self.status_snapshot = status_snapshot
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -17,6 +87,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self.send_health_response()
         elif self.path == '/status':
             self.send_status_response()
+        elif self.path == '/metrics':
+            self.send_metrics_response()
         else:
             self.send_response(404)
             self.end_headers()
@@ -24,25 +96,23 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
     
     def send_health_response(self):
         """Send simple health check response"""
-        try:
-            # Check if database exists and is accessible
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM processed_tweets")
-            conn.close()
-            
+        # The snapshot thread reads the database; request threads are short-lived and never
+        # open connections of their own
+        statistics, refreshed_at, error = self.server.status_snapshot.get()
+        
+        if statistics is not None and error is None:
             response = {
                 'status': 'healthy',
                 'timestamp': datetime.now().isoformat(),
-                'message': 'RUGGUARD Bot is operational'
+                'message': 'RUGGUARD Bot is operational',
+                'snapshot_time': refreshed_at.isoformat()
             }
             status_code = 200
-            
-        except Exception as e:
+        else:
             response = {
                 'status': 'unhealthy',
                 'timestamp': datetime.now().isoformat(),
-                'error': str(e)
+                'error': error or 'Status not yet available'
             }
             status_code = 500
         
@@ -51,77 +121,73 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(response).encode())
     
+    def send_metrics_response(self):
+        """Send stage timings and counters in Prometheus text format"""
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def send_status_response(self):
-        """Send detailed status response"""
-        try:
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            
-            # Get statistics
-            cursor.execute("SELECT COUNT(*) FROM processed_tweets")
-            total_processed = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM analysis_results")
-            total_analysis = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM processed_tweets 
-                WHERE processed_date > datetime('now', '-24 hours')
-            """)
-            recent_processed = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT processed_date FROM processed_tweets 
-                ORDER BY processed_date DESC LIMIT 1
-            """)
-            last_activity = cursor.fetchone()
-            
-            # Determine if bot is active
-            is_active = False
-            if last_activity:
-                last_time = datetime.fromisoformat(last_activity[0])
-                time_diff = datetime.now() - last_time
-                is_active = time_diff < timedelta(hours=1)
-            
-            response = {
-                'status': 'active' if is_active else 'idle',
-                'timestamp': datetime.now().isoformat(),
-                'statistics': {
-                    'total_processed': total_processed,
-                    'total_analysis': total_analysis,
-                    'recent_processed_24h': recent_processed,
-                    'last_activity': last_activity[0] if last_activity else None
-                },
-                'is_active': is_active
-            }
-            
-            conn.close()
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, indent=2).encode())
-            
-        except Exception as e:
+        """Send detailed status response from the background snapshot"""
+        statistics, refreshed_at, error = self.server.status_snapshot.get()
+        
+        if statistics is None:
             response = {
                 'status': 'error',
                 'timestamp': datetime.now().isoformat(),
-                'error': str(e)
+                'error': error or 'Status not yet available'
             }
             
             self.send_response(500)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
             self.wfile.write(json.dumps(response).encode())
+            return
+        
+        # Determine if bot is active
+        is_active = False
+        last_activity = statistics['last_activity']
+        if last_activity:
+            last_time = datetime.fromisoformat(last_activity)
+            time_diff = datetime.now() - last_time
+            is_active = time_diff < timedelta(hours=1)
+        
+        response = {
+            'status': 'active' if is_active else 'idle',
+            'timestamp': datetime.now().isoformat(),
+            'statistics': statistics,
+            'is_active': is_active,
+            'snapshot_time': refreshed_at.isoformat()
+        }
+        if error:
+            # Serve the last good snapshot but report why it is not refreshing
+            response['snapshot_error'] = error
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(response, indent=2).encode())
 
 def run_health_server(port=8080):
     """Run the health check server"""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, HealthCheckHandler)
+    status_snapshot = StatusSnapshot()
+    status_snapshot.start()
+    httpd = HealthCheckServer(server_address, HealthCheckHandler, status_snapshot)
     print(f"🏥 Health check server running on port {port}")
     print(f"📊 Status endpoint: http://localhost:{port}/status")
     print(f"💚 Health endpoint: http://localhost:{port}/health")
+    print(f"📈 Metrics endpoint: http://localhost:{port}/metrics")
     httpd.serve_forever()
 
+def start_health_server(port=8080):
+    """Run the health check server on a background thread inside the bot process"""
+    thread = threading.Thread(target=run_health_server, args=(port,), name='health-server', daemon=True)
+    thread.start()
+    return thread
+
 if __name__ == "__main__":
     run_health_server()
@@ -8,9 +8,15 @@ import os
 import sys
 import logging
 from bot import RugguardBot
+from health_check import start_health_server
+from config import HEALTH_CHECK_PORT
 
 def check_environment():
     """Check if all required environment variables are set"""
+    # Offline transports (fake server or fixtures) don't need real credentials
+    if os.getenv('X_API_BASE_URL') or os.getenv('X_API_FIXTURES_DIR'):
+        return True
+    
     required_vars = [
         'X_API_KEY',
         'X_API_SECRET', 
@@ -43,6 +49,10 @@ def main():
         sys.exit(1)
     
     try:
+        # Serve /health, /status and /metrics from the bot process so metrics are live
+        if HEALTH_CHECK_PORT:
+            start_health_server(HEALTH_CHECK_PORT)
+        
         # Initialize and run bot
         bot = RugguardBot()
         bot.run()
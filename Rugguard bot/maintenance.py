@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Database maintenance for RUGGUARD Bot
+Prunes rows past their retention window in small batches and returns freed pages to the OS
+"""
+
+import argparse
+import logging
+import threading
+import time
+from storage import get_storage
+from config import *
+
+# (table, date column, retention days) pruned by each maintenance run
+RETENTION_POLICIES = [
+    ('processed_tweets', 'processed_date', PROCESSED_TWEETS_RETENTION_DAYS),
+    ('analysis_results', 'analysis_date', ANALYSIS_RESULTS_RETENTION_DAYS),
+    ('analysis_history', 'analysis_date', ANALYSIS_HISTORY_RETENTION_DAYS),
+    ('tweet_fingerprints', 'created_date', TWEET_FINGERPRINTS_RETENTION_DAYS),
+    ('stats_hourly', 'hour', STATS_HOURLY_RETENTION_DAYS)
+]
+
+class DatabaseMaintenance:
+    """Background job that keeps the database size flat by pruning old rows"""
+
+    def __init__(self, db_path=DATABASE_PATH, policies=RETENTION_POLICIES,
+                 batch_size=MAINTENANCE_BATCH_SIZE, batch_pause=MAINTENANCE_BATCH_PAUSE_SECONDS,
+                 vacuum_pages=MAINTENANCE_VACUUM_PAGES):
+        self.storage = get_storage(db_path)
+        self.policies = policies
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.vacuum_pages = vacuum_pages
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def prune_table(self, table, date_column, retention_days):
+        """Delete rows older than the retention window, one short transaction per batch"""
+        deleted = 0
+        while not self._stop.is_set():
+            # Each batch is its own write transaction so the bot's writes interleave
+            count = self.storage.execute(f'''
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE {date_column} < datetime('now', ?) LIMIT ?
+                )
+            ''', (f'-{int(retention_days)} days', self.batch_size)).rowcount
+            deleted += count
+            if count < self.batch_size:
+                break
+            time.sleep(self.batch_pause)
+        return deleted
+
+    def vacuum(self):
+        """Return free pages to the OS in bounded steps; returns pages still free"""
+        while not self._stop.is_set():
+            free_pages = self.storage.fetchvalue("PRAGMA freelist_count", default=0)
+            if free_pages == 0:
+                return 0
+            # The pragma frees one page per step; executescript steps it to completion
+            self.storage.connection().executescript(
+                f"PRAGMA incremental_vacuum({int(min(free_pages, self.vacuum_pages))})"
+            )
+            if free_pages <= self.vacuum_pages:
+                return 0
+            time.sleep(self.batch_pause)
+        return self.storage.fetchvalue("PRAGMA freelist_count", default=0)
+
+    def run_once(self):
+        """Apply every retention policy, then compact; returns rows deleted per table"""
+        deleted = {}
+        for table, date_column, retention_days in self.policies:
+            try:
+                deleted[table] = self.prune_table(table, date_column, retention_days)
+            except Exception as e:
+                self.logger.error(f"Error pruning {table}: {e}")
+
+        try:
+            if any(deleted.values()):
+                self.vacuum()
+                # Copy the compacted pages back so the main file actually shrinks
+                self.storage.fetchall("PRAGMA wal_checkpoint(PASSIVE)")
+        except Exception as e:
+            self.logger.error(f"Error compacting database: {e}")
+
+        pruned = {table: count for table, count in deleted.items() if count}
+        if pruned:
+            self.logger.info(f"🧹 Pruned old rows: {pruned}")
+        return deleted
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(interval)
+
+    def start(self, interval=MAINTENANCE_INTERVAL_SECONDS):
+        """Run maintenance on a daemon thread now and then every `interval` seconds"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='db-maintenance', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+def main():
+    """Run one maintenance pass from the command line"""
+    parser = argparse.ArgumentParser(description="Prune and compact the RUGGUARD Bot database")
+    parser.add_argument('--db', default=DATABASE_PATH, help="Database file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    deleted = DatabaseMaintenance(args.db).run_once()
+    for table, count in deleted.items():
+        print(f"{table}: {count} rows deleted")
+
+if __name__ == "__main__":
+    main()
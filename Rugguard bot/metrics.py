@@ -0,0 +1,181 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values)) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = [
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in pairs
+    ]
+    return '{' + ','.join(escaped) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonically increasing count, optionally split by labels"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, optionally split by labels"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0] * len(self.buckets) + [0.0, 0]
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+
+        lines = []
+        for key, state in items:
+            for bound, count in zip(self.buckets, state):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_value(bound))])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labelnames=()):
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.histogram(
+    'rugguard_stage_duration_seconds',
+    'Time spent in each trigger processing stage',
+    ['stage']
+)
+API_CALLS = REGISTRY.counter(
+    'rugguard_api_calls_total',
+    'X API calls by endpoint and outcome',
+    ['endpoint', 'outcome']
+)
+API_CALL_DURATION = REGISTRY.histogram(
+    'rugguard_api_call_duration_seconds',
+    'X API call latency by endpoint',
+    ['endpoint']
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    'rugguard_cache_lookups_total',
+    'Cache lookups by cache and result',
+    ['cache', 'result']
+)
+RATE_LIMIT_WAITS = REGISTRY.counter(
+    'rugguard_rate_limit_waits_total',
+    'Times a call waited for rate-limit budget',
+    ['endpoint']
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.counter(
+    'rugguard_rate_limit_wait_seconds_total',
+    'Total seconds spent waiting for rate-limit budget',
+    ['endpoint']
+)
+RATE_LIMIT_DEFERRALS = REGISTRY.counter(
+    'rugguard_rate_limit_deferrals_total',
+    'Calls skipped because their rate-limit budget was exhausted',
+    ['endpoint']
+)
+TRIGGERS_PROCESSED = REGISTRY.counter(
+    'rugguard_triggers_processed_total',
+    'Trigger tweets handled by outcome',
+    ['outcome']
+)
+CYCLE_DURATION = REGISTRY.histogram(
+    'rugguard_cycle_duration_seconds',
+    'Duration of a full monitoring cycle'
+)
+
+def time_stage(stage):
+    """Context manager recording how long a processing stage took"""
+    return STAGE_DURATION.time(stage=stage)
+
+def timed_stage(stage):
+    """Decorator recording how long each call of a function took as a processing stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,276 @@
+import logging
+import sqlite3
+from config import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+def _initial_schema(cursor):
+    """Tables and indexes created by the original setup_database.py, safe to re-run on those databases"""
+    # Create table for storing analysis results
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT UNIQUE,
+            username TEXT,
+            account_age_days INTEGER,
+            follower_count INTEGER,
+            following_count INTEGER,
+            follower_ratio REAL,
+            bio_length INTEGER,
+            bio_keywords TEXT,
+            avg_engagement REAL,
+            trusted_followers_count INTEGER,
+            trustworthiness_score REAL,
+            analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            tweet_count INTEGER,
+            verified INTEGER,
+            trusted_followers TEXT,
+            risk_factors TEXT,
+            positive_indicators TEXT
+        )
+    ''')
+    
+    # Add columns introduced after the initial schema to existing databases
+    cursor.execute("PRAGMA table_info(analysis_results)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column, column_type in [
+        ('tweet_count', 'INTEGER'),
+        ('verified', 'INTEGER'),
+        ('trusted_followers', 'TEXT'),
+        ('risk_factors', 'TEXT'),
+        ('positive_indicators', 'TEXT')
+    ]:
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE analysis_results ADD COLUMN {column} {column_type}")
+    
+    # Cached analyses are looked up by username
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_results_username
+        ON analysis_results (username COLLATE NOCASE)
+    ''')
+    
+    # Create table for trusted accounts cache
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trusted_accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            user_id TEXT,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create table for processed tweets to avoid duplicates
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS processed_tweets (
+            tweet_id TEXT PRIMARY KEY,
+            processed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Retention pruning and recent-activity queries filter on these dates
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_processed_tweets_processed_date
+        ON processed_tweets (processed_date)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_results_analysis_date
+        ON analysis_results (analysis_date)
+    ''')
+    
+    # Create table for bot state such as the search cursor
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bot_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Create tables for maintained statistics so status checks never count history
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='bot_stats'")
+    stats_exist = cursor.fetchone() is not None
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bot_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0,
+            updated_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stats_hourly (
+            name TEXT NOT NULL,
+            hour TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (name, hour)
+        )
+    ''')
+    
+    if not stats_exist:
+        # Seed the counters from rows recorded before the statistics tables existed
+        cursor.execute('''
+            INSERT OR IGNORE INTO bot_stats (name, value, updated_date)
+            SELECT 'processed_tweets', COUNT(*), MAX(processed_date) FROM processed_tweets
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO bot_stats (name, value, updated_date)
+            SELECT 'analyses', COUNT(*), MAX(analysis_date) FROM analysis_results
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO stats_hourly (name, hour, value)
+            SELECT 'processed_tweets', strftime('%Y-%m-%d %H:00:00', processed_date), COUNT(*)
+            FROM processed_tweets WHERE processed_date > datetime('now', '-25 hours')
+            GROUP BY 2
+        ''')
+        cursor.execute('''
+            INSERT OR IGNORE INTO stats_hourly (name, hour, value)
+            SELECT 'analyses', strftime('%Y-%m-%d %H:00:00', analysis_date), COUNT(*)
+            FROM analysis_results WHERE analysis_date > datetime('now', '-25 hours')
+            GROUP BY 2
+        ''')
+
+def _analysis_history(cursor):
+    """Keep every analysis with its compact feature vector instead of overwriting the last one"""
+    cursor.execute("PRAGMA table_info(analysis_results)")
+    if 'features' not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE analysis_results ADD COLUMN features TEXT")
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_history (
+            id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            username TEXT,
+            analysis_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            trustworthiness_score REAL,
+            features TEXT NOT NULL,
+            trusted_followers TEXT
+        )
+    ''')
+    
+    # Score timelines are read per account; retention pruning filters on the date
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_user
+        ON analysis_history (user_id, analysis_date)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_analysis_date
+        ON analysis_history (analysis_date)
+    ''')
+
+def _tweet_fingerprints(cursor):
+    """SimHash fingerprints of analyzed tweets, one 8-byte integer per tweet"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tweet_fingerprints (
+            tweet_id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            simhash INTEGER NOT NULL,
+            created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tweet_fingerprints_user
+        ON tweet_fingerprints (user_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tweet_fingerprints_created_date
+        ON tweet_fingerprints (created_date)
+    ''')
+
+def _scam_network_index(cursor):
+    """16-bit LSH bands of each tweet fingerprint, indexed for cross-account lookups (see scam_network.py)"""
+    for band in range(4):
+        cursor.execute(f'ALTER TABLE tweet_fingerprints ADD COLUMN band{band} INTEGER')
+        # Tweets too short to index leave their bands NULL and stay out of the indexes
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_tweet_fingerprints_band{band}
+            ON tweet_fingerprints (band{band}) WHERE band{band} IS NOT NULL
+        ''')
+
+def _trusted_following(cursor):
+    """Inverted index of the accounts each trusted account follows, keyed by the followed user_id"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trusted_following (
+            user_id TEXT NOT NULL,
+            trusted_username TEXT NOT NULL,
+            generation INTEGER NOT NULL,
+            PRIMARY KEY (user_id, trusted_username)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_trusted_following_trusted
+        ON trusted_following (trusted_username, generation)
+    ''')
+    # One row per trusted account; synced_date is set by the last complete pass
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS trusted_following_sync (
+            trusted_username TEXT PRIMARY KEY,
+            trusted_user_id TEXT,
+            generation INTEGER NOT NULL DEFAULT 0,
+            following_count INTEGER NOT NULL DEFAULT 0,
+            synced_date TIMESTAMP
+        )
+    ''')
+
+def _trusted_following_sync_status(cursor):
+    """Track truncated and unresolvable trusted accounts so the index knows when it is authoritative"""
+    # attempted_date: last finished pass, complete or truncated; synced_date stays the last complete one
+    cursor.execute('ALTER TABLE trusted_following_sync ADD COLUMN attempted_date TIMESTAMP')
+    cursor.execute('ALTER TABLE trusted_following_sync ADD COLUMN truncated INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('ALTER TABLE trusted_following_sync ADD COLUMN not_found INTEGER NOT NULL DEFAULT 0')
+    cursor.execute('UPDATE trusted_following_sync SET attempted_date = synced_date')
+
+def _trusted_followers_complete(cursor):
+    """Flag analyses whose follower scan was cut off, so they are not reused for the whole cooldown"""
+    cursor.execute('ALTER TABLE analysis_results ADD COLUMN trusted_followers_complete INTEGER NOT NULL DEFAULT 1')
+
+# (version, description, function) applied in order; never edit a released entry, append a new one
+MIGRATIONS = [
+    (1, 'initial schema', _initial_schema),
+    (2, 'analysis history and feature vectors', _analysis_history),
+    (3, 'tweet fingerprints', _tweet_fingerprints),
+    (4, 'scam network index', _scam_network_index),
+    (5, 'trusted following index', _trusted_following),
+    (6, 'trusted following sync status', _trusted_following_sync_status),
+    (7, 'trusted followers completeness', _trusted_followers_complete)
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(conn):
+    """Schema version recorded in the database header"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def _enable_incremental_vacuum(conn):
+    """Let maintenance.py return freed pages; existing databases need a full VACUUM once to switch modes"""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+
+def migrate(db_path=DATABASE_PATH):
+    """Apply pending migrations, each in its own transaction; returns the resulting schema version"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        _enable_incremental_vacuum(conn)
+        current = schema_version(conn)
+        if current > LATEST_VERSION:
+            logger.warning(f"Database schema version {current} is newer than this code ({LATEST_VERSION})")
+            return current
+        
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            
+            logger.info(f"Applying migration {version}: {description}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                apply(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            current = version
+        
+        return current
+    finally:
+        conn.close()
@@ -0,0 +1,98 @@
+import logging
+import threading
+from collections import OrderedDict
+from storage import get_storage
+from stats import record_stat, STAT_PROCESSED_TWEETS
+from metrics import CACHE_LOOKUPS, timed_stage
+from config import DATABASE_PATH, RECENT_PROCESSED_IDS_SIZE
+
+# Stay under SQLite's default host-parameter limit for IN (...) lookups
+QUERY_CHUNK_SIZE = 500
+
+class ProcessedTweetTracker:
+    """Bulk dedup of trigger tweets: a bounded recent-ID set in front of processed_tweets"""
+
+    def __init__(self, db_path=DATABASE_PATH, max_recent=RECENT_PROCESSED_IDS_SIZE):
+        self.storage = get_storage(db_path)
+        self.max_recent = max_recent
+        self.logger = logging.getLogger(__name__)
+        self._recent = OrderedDict()  # Insertion-ordered set of tweet ids
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Preload the most recently processed ids so restarts avoid disk lookups"""
+        try:
+            rows = self.storage.fetchall(
+                "SELECT tweet_id FROM processed_tweets ORDER BY rowid DESC LIMIT ?",
+                (self.max_recent,)
+            )
+            with self._lock:
+                for row in reversed(rows):
+                    self._remember(row[0])
+        except Exception as e:
+            self.logger.error(f"Error warming processed tweet cache: {e}")
+
+    def filter_unprocessed(self, tweet_ids):
+        """Return the ids that have not been processed, in input order, with one query per chunk"""
+        ids = [str(tweet_id) for tweet_id in tweet_ids]
+
+        with self._lock:
+            unknown = [tweet_id for tweet_id in ids if tweet_id not in self._recent]
+        CACHE_LOOKUPS.inc(len(ids) - len(unknown), cache='processed_tweets', result='memory_hit')
+        CACHE_LOOKUPS.inc(len(unknown), cache='processed_tweets', result='db_lookup')
+
+        seen = set()
+        for start in range(0, len(unknown), QUERY_CHUNK_SIZE):
+            chunk = unknown[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.storage.fetchall(
+                f"SELECT tweet_id FROM processed_tweets WHERE tweet_id IN ({placeholders})",
+                chunk
+            )
+            seen.update(row[0] for row in rows)
+
+        with self._lock:
+            for tweet_id in seen:
+                self._remember(tweet_id)
+
+        unknown = set(unknown)
+        return [tweet_id for tweet_id in ids if tweet_id in unknown and tweet_id not in seen]
+
+    def mark_processed(self, tweet_ids):
+        """Record ids as processed in memory now; they are written to disk on flush()"""
+        with self._lock:
+            for tweet_id in tweet_ids:
+                tweet_id = str(tweet_id)
+                self._remember(tweet_id)
+                self._pending.append(tweet_id)
+
+    @timed_stage('db_write')
+    def flush(self):
+        """Write pending processed ids and their statistics in a single batched transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        if not pending:
+            return 0
+
+        try:
+            with self.storage.transaction() as conn:
+                inserted = conn.executemany(
+                    "INSERT OR IGNORE INTO processed_tweets (tweet_id) VALUES (?)",
+                    [(tweet_id,) for tweet_id in pending]
+                ).rowcount
+                record_stat(conn, STAT_PROCESSED_TWEETS, inserted)
+            return inserted
+        except Exception:
+            # Keep the ids queued so the next flush retries them
+            with self._lock:
+                self._pending = pending + self._pending
+            raise
+
+    def _remember(self, tweet_id):
+        """Add an id to the bounded recent set (caller holds the lock)"""
+        self._recent[tweet_id] = None
+        self._recent.move_to_end(tweet_id)
+        while len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from metrics import RATE_LIMIT_WAITS, RATE_LIMIT_WAIT_SECONDS
+from config import MAX_REQUESTS_PER_HOUR, LOW_PRIORITY_RESERVE, RATE_LIMIT_MAX_WAIT_SECONDS
+
+PRIORITY_HIGH = 'high'
+PRIORITY_LOW = 'low'
+
+class RateLimitDeferred(Exception):
+    """Raised when a call is skipped because its rate-limit budget is exhausted"""
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(f"{endpoint} rate limited, retry in {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Token bucket that refills continuously and can be corrected from server headers"""
+
+    def __init__(self, capacity, window_seconds):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity) if capacity else 0.0
+        self.reset_at = None
+        self.updated_at = time.time()
+
+    def refill(self, now):
+        """Add tokens earned since the last update"""
+        if self.capacity is None:
+            return
+
+        if self.reset_at is not None:
+            # Server-driven window: nothing comes back until the advertised reset
+            if now >= self.reset_at:
+                self.tokens = float(self.capacity)
+                self.reset_at = None
+        else:
+            rate = self.capacity / self.window_seconds
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * rate)
+
+        self.updated_at = now
+
+    def available(self, reserve=0.0, calls=1):
+        """Check whether `calls` tokens can be taken while leaving `reserve` of capacity untouched"""
+        if self.capacity is None:
+            return True
+        return self.tokens - calls >= self.capacity * reserve
+
+    def wait_time(self, now, reserve=0.0, calls=1):
+        """Seconds until `calls` tokens are available"""
+        if self.available(reserve, calls):
+            return 0.0
+        if self.reset_at is not None:
+            return max(0.0, self.reset_at - now)
+        missing = self.capacity * reserve + calls - self.tokens
+        return missing * self.window_seconds / self.capacity
+
+    def take(self):
+        """Consume one token"""
+        if self.capacity is not None:
+            self.tokens -= 1
+
+    def update(self, limit, remaining, reset_at, now):
+        """Align the bucket with x-rate-limit-* headers"""
+        self.capacity = limit
+        self.tokens = float(remaining)
+        self.updated_at = now
+        # Only pin to the reset time once the window is drained; otherwise keep refilling smoothly
+        self.reset_at = reset_at if remaining <= 0 else None
+
+class RateLimiter:
+    """Per-endpoint token buckets plus an hourly budget for low-priority calls"""
+
+    def __init__(self, max_requests_per_hour=MAX_REQUESTS_PER_HOUR,
+                 low_priority_reserve=LOW_PRIORITY_RESERVE,
+                 max_wait_seconds=RATE_LIMIT_MAX_WAIT_SECONDS):
+        self.logger = logging.getLogger(__name__)
+        self.global_bucket = TokenBucket(max_requests_per_hour, 3600)
+        self.endpoint_buckets = {}
+        self.low_priority_reserve = low_priority_reserve
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint):
+        """Get the bucket for an endpoint; limits are unknown until headers arrive"""
+        bucket = self.endpoint_buckets.get(endpoint)
+        if bucket is None:
+            bucket = TokenBucket(None, 900)
+            self.endpoint_buckets[endpoint] = bucket
+        return bucket
+
+    def _reserve(self, priority):
+        return self.low_priority_reserve if priority == PRIORITY_LOW else 0.0
+
+    def _buckets(self, endpoint, priority):
+        """(bucket, reserve) pairs a call draws on; endpoint None means the hourly budget alone.
+        Only low-priority calls count against the hourly budget, so replies never queue behind background work."""
+        buckets = []
+        if endpoint is not None:
+            buckets.append((self._bucket(endpoint), self._reserve(priority)))
+        if endpoint is None or priority == PRIORITY_LOW:
+            buckets.append((self.global_bucket, 0.0))
+        return buckets
+
+    def _wait_time_locked(self, endpoint, priority, now, calls=1):
+        buckets = self._buckets(endpoint, priority)
+        for bucket, _ in buckets:
+            bucket.refill(now)
+        return max(bucket.wait_time(now, reserve, calls) for bucket, reserve in buckets)
+
+    def can_call(self, endpoint, priority=PRIORITY_HIGH):
+        """Check whether a call to `endpoint` would go through right now"""
+        return self.time_until_available(endpoint, priority) == 0
+
+    def time_until_available(self, endpoint, priority=PRIORITY_HIGH, calls=1):
+        """Seconds until `endpoint` can be called `calls` times at the given priority"""
+        with self._lock:
+            return self._wait_time_locked(endpoint, priority, time.time(), calls)
+
+    def available_tokens(self, endpoint, priority=PRIORITY_HIGH):
+        """Calls `endpoint` can make right now at this priority, or None if it has no known limit"""
+        with self._lock:
+            now = time.time()
+            counts = []
+            for bucket, reserve in self._buckets(endpoint, priority):
+                bucket.refill(now)
+                if bucket.capacity is not None:
+                    counts.append(max(0, int(bucket.tokens - bucket.capacity * reserve)))
+            return min(counts) if counts else None
+
+    def acquire(self, endpoint, priority=PRIORITY_HIGH, max_wait=None):
+        """Take a token for `endpoint`, waiting up to max_wait seconds; returns False if deferred"""
+        if max_wait is None:
+            max_wait = self.max_wait_seconds if priority == PRIORITY_HIGH else 0
+        deadline = time.time() + max_wait
+
+        while True:
+            with self._lock:
+                now = time.time()
+                wait = self._wait_time_locked(endpoint, priority, now)
+                if wait == 0:
+                    for bucket, _ in self._buckets(endpoint, priority):
+                        bucket.take()
+                    return True
+
+            if now + wait > deadline:
+                return False
+
+            self.logger.info(f"Rate limit reached for {endpoint}, waiting {wait:.0f}s")
+            RATE_LIMIT_WAITS.inc(endpoint=endpoint)
+            RATE_LIMIT_WAIT_SECONDS.inc(wait, endpoint=endpoint)
+            time.sleep(wait)
+
+    def update_from_headers(self, endpoint, headers):
+        """Record x-rate-limit-limit/remaining/reset from an API response"""
+        try:
+            remaining = headers.get('x-rate-limit-remaining')
+            if remaining is None:
+                return
+            limit = int(headers.get('x-rate-limit-limit') or remaining)
+            reset = headers.get('x-rate-limit-reset')
+            reset_at = int(reset) if reset else None
+
+            with self._lock:
+                self._bucket(endpoint).update(limit, int(remaining), reset_at, time.time())
+
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Ignoring malformed rate limit headers for {endpoint}: {e}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Offline rescoring for RUGGUARD Bot
+Recomputes stored trust scores from their feature vectors after scoring or threshold changes,
+without calling the X API
+"""
+
+import argparse
+import functools
+import json
+import logging
+import sys
+import time
+from storage import get_storage
+from analyzer import AccountAnalyzer
+from features import decode_features
+from batch_scoring import find_mismatches, score_columns, to_columns, risk_messages, positive_messages
+from migrations import migrate
+from config import DATABASE_PATH, RESCORE_CHUNK_SIZE
+
+# Flag combinations repeat across millions of rows, so each JSON encoding is built once
+@functools.lru_cache(maxsize=4096)
+def risk_json(flags, spam_indicators):
+    return json.dumps(risk_messages(flags, spam_indicators))
+
+@functools.lru_cache(maxsize=4096)
+def positive_json(flags, trusted_followers_count):
+    return json.dumps(positive_messages(flags, trusted_followers_count))
+
+class Rescorer:
+    """Streams analysis_results in id order and rewrites scores whose inputs are stored"""
+
+    def __init__(self, analyzer, db_path=DATABASE_PATH, chunk_size=RESCORE_CHUNK_SIZE):
+        self.analyzer = analyzer
+        self.storage = get_storage(db_path)
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(__name__)
+
+    def chunks(self):
+        """Yield lists of (id, features, score, risk_factors, positive_indicators) rows, keyset-paginated"""
+        last_id = 0
+        while True:
+            rows = self.storage.fetchall('''
+                SELECT id, features, trustworthiness_score, risk_factors, positive_indicators
+                FROM analysis_results
+                WHERE id > ? AND features IS NOT NULL
+                ORDER BY id LIMIT ?
+            ''', (last_id, self.chunk_size))
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
+
+    def rescore_chunk(self, rows):
+        """Recompute a chunk; returns update rows for the analyses whose results changed"""
+        features = [decode_features(row['features']) for row in rows]
+        scores, risks, positives = score_columns(to_columns(features))
+
+        updates = []
+        for row, feature, score, risk, positive in zip(rows, features, scores, risks, positives):
+            risks_encoded = risk_json(risk, tuple(feature['spam_indicators']))
+            positives_encoded = positive_json(positive, feature['trusted_followers_count'])
+            if (score != row['trustworthiness_score'] or risks_encoded != row['risk_factors']
+                    or positives_encoded != row['positive_indicators']):
+                updates.append((score, risks_encoded, positives_encoded, row['id']))
+        return updates
+
+    def verify(self, max_examples=20):
+        """Check the batch scorer against the scalar scoring path; returns (checked, mismatches, examples)"""
+        checked = mismatched = 0
+        examples = []
+        for rows in self.chunks():
+            features = [decode_features(row['features']) for row in rows]
+            for index, scalar, batch in find_mismatches(self.analyzer, features):
+                mismatched += 1
+                if len(examples) < max_examples:
+                    examples.append((rows[index]['id'], scalar, batch))
+            checked += len(rows)
+        return checked, mismatched, examples
+
+    def run(self, dry_run=False):
+        """Rescore every stored analysis; returns (rows scanned, rows changed)"""
+        scanned = changed = 0
+        started = time.perf_counter()
+
+        for rows in self.chunks():
+            updates = self.rescore_chunk(rows)
+            if updates and not dry_run:
+                self.storage.executemany('''
+                    UPDATE analysis_results
+                    SET trustworthiness_score = ?, risk_factors = ?, positive_indicators = ?
+                    WHERE id = ?
+                ''', updates)
+
+            scanned += len(rows)
+            changed += len(updates)
+            self.logger.info(f"Rescored {scanned} analyses, {changed} changed ({time.perf_counter() - started:.1f}s)")
+
+        return scanned, changed
+
+def main():
+    """Main rescoring entry point"""
+    parser = argparse.ArgumentParser(description="Recompute stored RUGGUARD trust scores from saved features")
+    parser.add_argument('--db', default=DATABASE_PATH, help="Database file")
+    parser.add_argument('--chunk-size', type=int, default=RESCORE_CHUNK_SIZE, help="Rows read and written per transaction")
+    parser.add_argument('--dry-run', action='store_true', help="Count changed scores without writing them")
+    parser.add_argument('--verify', action='store_true',
+                        help="Check batch scoring matches the per-account scoring path, without writing")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    migrate(args.db)
+    rescorer = Rescorer(AccountAnalyzer(x_client=None), args.db, args.chunk_size)
+
+    if args.verify:
+        checked, mismatched, examples = rescorer.verify()
+        for row_id, scalar, batch in examples:
+            print(f"❌ analysis {row_id}: scalar {scalar} != batch {batch}")
+        print(f"Verified {checked} analyses; {mismatched} mismatches")
+        sys.exit(1 if mismatched else 0)
+
+    scanned, changed = rescorer.run(dry_run=args.dry_run)
+
+    action = "would change" if args.dry_run else "changed"
+    print(f"Rescored {scanned} analyses; {changed} {action}")
+    # Analyses without stored features predate feature vectors and keep their score
+    skipped = rescorer.storage.fetchvalue("SELECT COUNT(*) FROM analysis_results WHERE features IS NULL", default=0)
+    if skipped:
+        print(f"Skipped {skipped} analyses stored before feature vectors were recorded")
+
+if __name__ == "__main__":
+    main()
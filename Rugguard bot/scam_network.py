@@ -0,0 +1,59 @@
+"""
+Cross-account scam network index for RUGGUARD Bot
+Looks up new accounts' tweet fingerprints against those stored for earlier analyses, so copy-paste
+shill text from accounts already scored as high risk is flagged without extra API calls
+"""
+
+import logging
+from storage import get_storage
+from fingerprint import bands, hamming_distance, from_signed, normalize_text
+from config import *
+
+# 16-bit bands, one indexed column each in tweet_fingerprints (added by migration 4)
+INDEX_BANDS = 4
+BAND_COLUMNS = tuple(f'band{index}' for index in range(INDEX_BANDS))
+
+def index_bands(text, fingerprint):
+    """Band values to index for a tweet, or None when the text is too short to tell copies apart"""
+    if len(normalize_text(text)) < SCAM_NETWORK_MIN_TEXT_LENGTH:
+        return None
+    return bands(fingerprint, INDEX_BANDS)
+
+class ScamNetworkIndex:
+    """Persistent LSH index over the fingerprints in tweet_fingerprints"""
+
+    def __init__(self, db_path=DATABASE_PATH, max_distance=SCAM_NETWORK_MAX_DISTANCE,
+                 risk_score=SCAM_NETWORK_RISK_SCORE):
+        self.storage = get_storage(db_path)
+        self.max_distance = max_distance
+        self.risk_score = risk_score
+        self.logger = logging.getLogger(__name__)
+
+        # Fingerprints within max_distance bits of each other share at least one band value,
+        # so probing each band column's index finds every candidate
+        probes = ' OR '.join(f'{column} = ?' for column in BAND_COLUMNS)
+        self._candidates_query = f'SELECT user_id, simhash FROM tweet_fingerprints WHERE ({probes}) AND user_id != ?'
+
+    def matching_accounts(self, user_id, indexed_fingerprints):
+        """Return ids of high-risk accounts that posted a near-copy of any given (fingerprint, bands) pair"""
+        try:
+            copied_from = set()
+            for fingerprint, band_values in indexed_fingerprints:
+                for row in self.storage.fetchall(self._candidates_query, (*band_values, str(user_id))):
+                    if hamming_distance(from_signed(row['simhash']), fingerprint) <= self.max_distance:
+                        copied_from.add(row['user_id'])
+            if not copied_from:
+                return []
+
+            # Most band collisions are chance, so scores are only looked up for real copies;
+            # scores missing trusted followers from a cut-off scan may be wrongly low
+            placeholders = ','.join('?' * len(copied_from))
+            rows = self.storage.fetchall(f'''
+                SELECT user_id FROM analysis_results
+                WHERE user_id IN ({placeholders}) AND trustworthiness_score < ? AND trusted_followers_complete = 1
+            ''', (*copied_from, self.risk_score))
+            return sorted(row['user_id'] for row in rows)
+
+        except Exception as e:
+            self.logger.error(f"Error checking scam network index: {e}")
+            return []
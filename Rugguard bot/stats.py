@@ -0,0 +1,54 @@
+import logging
+from storage import get_storage
+from config import DATABASE_PATH
+
+# Counter names in bot_stats and stats_hourly
+STAT_PROCESSED_TWEETS = 'processed_tweets'
+STAT_ANALYSES = 'analyses'
+
+HOUR_FORMAT = '%Y-%m-%d %H:00:00'
+
+def record_stat(conn, name, amount=1):
+    """Add to a counter and its current hourly bucket; call inside the transaction writing the rows counted"""
+    if amount <= 0:
+        return
+    conn.execute('''
+        INSERT INTO bot_stats (name, value, updated_date) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET value = value + excluded.value, updated_date = excluded.updated_date
+    ''', (name, amount))
+    conn.execute(f'''
+        INSERT INTO stats_hourly (name, hour, value) VALUES (?, strftime('{HOUR_FORMAT}', 'now'), ?)
+        ON CONFLICT(name, hour) DO UPDATE SET value = value + excluded.value
+    ''', (name, amount))
+
+class BotStats:
+    """Reads the statistics counters maintained alongside processed_tweets and analysis_results"""
+
+    def __init__(self, db_path=DATABASE_PATH):
+        self.storage = get_storage(db_path)
+        self.logger = logging.getLogger(__name__)
+
+    def total(self, name):
+        """All-time value of a counter"""
+        return self.storage.fetchvalue("SELECT value FROM bot_stats WHERE name = ?", (name,), 0)
+
+    def last_updated(self, name):
+        """When a counter last changed, as a UTC timestamp string, or None"""
+        return self.storage.fetchvalue("SELECT updated_date FROM bot_stats WHERE name = ?", (name,))
+
+    def recent(self, name, hours=24):
+        """Sum of a counter over the last `hours` hourly buckets"""
+        return self.storage.fetchvalue(f'''
+            SELECT COALESCE(SUM(value), 0) FROM stats_hourly
+            WHERE name = ? AND hour > strftime('{HOUR_FORMAT}', 'now', ?)
+        ''', (name, f'-{int(hours)} hours'), 0)
+
+    def summary(self):
+        """Totals and 24h activity for the status surfaces"""
+        return {
+            'total_processed': self.total(STAT_PROCESSED_TWEETS),
+            'total_analysis': self.total(STAT_ANALYSES),
+            'recent_processed_24h': self.recent(STAT_PROCESSED_TWEETS),
+            'recent_analysis_24h': self.recent(STAT_ANALYSES),
+            'last_activity': self.last_updated(STAT_PROCESSED_TWEETS)
+        }
@@ -4,10 +4,11 @@ Status checker for RUGGUARD Bot
 Run this script to check if the bot is running and get statistics
 """
 
-import sqlite3
 import os
 import sys
 from datetime import datetime, timedelta
+from storage import get_storage
+from stats import BotStats
 from config import DATABASE_PATH
 
 def check_bot_status():
@@ -20,14 +21,12 @@ def check_bot_status():
         return False
     
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
+        storage = get_storage(DATABASE_PATH)
         
         # Check if tables exist
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = [row[0] for row in storage.fetchall("SELECT name FROM sqlite_master WHERE type='table'")]
         
-        required_tables = ['processed_tweets', 'analysis_results', 'trusted_accounts']
+        required_tables = ['processed_tweets', 'analysis_results', 'trusted_accounts', 'bot_stats', 'stats_hourly']
         missing_tables = [t for t in required_tables if t not in tables]
         
         if missing_tables:
@@ -38,36 +37,19 @@ def check_bot_status():
         print("🛡️ RUGGUARD BOT STATUS CHECK")
         print("=" * 50)
         
-        # Get processing statistics
-        cursor.execute("SELECT COUNT(*) FROM processed_tweets")
-        total_processed = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM analysis_results")
-        total_analysis = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM trusted_accounts")
-        trusted_count = cursor.fetchone()[0]
+        # Get processing statistics from the maintained counters
+        summary = BotStats(DATABASE_PATH).summary()
+        total_processed = summary['total_processed']
+        total_analysis = summary['total_analysis']
+        trusted_count = storage.fetchvalue("SELECT COUNT(*) FROM trusted_accounts")
         
         # Get recent activity
-        cursor.execute("""
-            SELECT COUNT(*) FROM processed_tweets 
-            WHERE processed_date > datetime('now', '-24 hours')
-        """)
-        recent_processed = cursor.fetchone()[0]
-        
-        cursor.execute("""
-            SELECT COUNT(*) FROM analysis_results 
-            WHERE analysis_date > datetime('now', '-24 hours')
-        """)
-        recent_analysis = cursor.fetchone()[0]
+        recent_processed = summary['recent_processed_24h']
+        recent_analysis = summary['recent_analysis_24h']
         
         # Get last activity
-        cursor.execute("""
-            SELECT processed_date FROM processed_tweets 
-            ORDER BY processed_date DESC LIMIT 1
-        """)
-        last_activity = cursor.fetchone()
-        last_activity_str = last_activity[0] if last_activity else "Never"
+        last_activity = summary['last_activity']
+        last_activity_str = last_activity or "Never"
         
         # Display status
         print(f" Total Tweets Processed: {total_processed}")
@@ -78,7 +60,7 @@ def check_bot_status():
         
         # Check if bot seems active
         if last_activity:
-            last_time = datetime.fromisoformat(last_activity[0])
+            last_time = datetime.fromisoformat(last_activity)
             time_diff = datetime.now() - last_time
             
             if time_diff < timedelta(hours=1):
@@ -93,18 +75,17 @@ def check_bot_status():
         # Recent analyses
         if recent_analysis > 0:
             print(f"\n📈 Recent Analyses:")
-            cursor.execute("""
+            rows = storage.fetchall("""
                 SELECT username, trustworthiness_score, analysis_date 
                 FROM analysis_results 
                 WHERE analysis_date > datetime('now', '-24 hours')
                 ORDER BY analysis_date DESC LIMIT 5
             """)
             
-            for row in cursor.fetchall():
+            for row in rows:
                 username, score, date = row
                 print(f"  • @{username}: {score}/100 ({date})")
         
-        conn.close()
         return True
         
     except Exception as e:
@@ -0,0 +1,117 @@
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from config import DATABASE_PATH, SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB, SQLITE_STATEMENT_CACHE_SIZE
+
+class Storage:
+    """Shared SQLite access layer holding one long-lived connection per thread"""
+
+    def __init__(self, db_path=DATABASE_PATH):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self._connections = []  # (owning thread, connection)
+        self._connections_lock = threading.Lock()
+
+    def connection(self):
+        """Get this thread's connection, opening and tuning it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,  # Autocommit; multi-statement writes use transaction()
+                cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            self._configure(conn)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._close_finished_locked()
+                self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    def _configure(self, conn):
+        """Apply pragmas for concurrent readers alongside a single writer"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size=-{int(SQLITE_CACHE_SIZE_KB)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements in one write transaction; nested calls join the outer one"""
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    def execute(self, sql, params=()):
+        """Execute a single statement"""
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, rows):
+        """Execute a statement for many parameter rows in one transaction; returns rows changed"""
+        with self.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def fetchone(self, sql, params=()):
+        """Fetch a single row"""
+        return self.connection().execute(sql, params).fetchone()
+
+    def fetchall(self, sql, params=()):
+        """Fetch all rows"""
+        return self.connection().execute(sql, params).fetchall()
+
+    def fetchvalue(self, sql, params=(), default=None):
+        """Fetch the first column of the first row"""
+        row = self.fetchone(sql, params)
+        return row[0] if row is not None else default
+
+    def _close_finished_locked(self):
+        """Close connections whose threads have exited, so short-lived threads don't leak them"""
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+                continue
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._connections = alive
+
+    def close(self):
+        """Close every connection opened through this storage"""
+        with self._connections_lock:
+            for _, conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+def get_storage(db_path=DATABASE_PATH):
+    """Get the process-wide Storage for a database file"""
+    with _storages_lock:
+        storage = _storages.get(db_path)
+        if storage is None:
+            storage = Storage(db_path)
+            _storages[db_path] = storage
+        return storage
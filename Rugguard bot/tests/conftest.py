@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+# The bot is a flat set of modules run from its own directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(autouse=True)
+def isolated_database(tmp_path, monkeypatch):
+    """Run every test in its own directory, so DATABASE_PATH points at a fresh SQLite file"""
+    import storage
+    from migrations import migrate
+    monkeypatch.chdir(tmp_path)
+    # Storages are cached by path, and DATABASE_PATH is relative
+    monkeypatch.setattr(storage, '_storages', {})
+    migrate()
+    yield
+    for db in storage._storages.values():
+        db.close()
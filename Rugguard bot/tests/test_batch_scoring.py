@@ -0,0 +1,52 @@
+import random
+import pytest
+import batch_scoring
+from analyzer import AccountAnalyzer
+from batch_scoring import find_mismatches, score_features_batch
+from features import follower_ratio
+
+def boundary_features(count, seed=4):
+    """Feature dicts drawn around every scoring threshold, plus accounts following nobody"""
+    rng = random.Random(seed)
+    features = []
+    for _ in range(count):
+        follower_count = rng.choice([0, 1, 5, 10, 50, 100, 1000, 5000, 100000])
+        following_count = rng.choice([0, 1, 10, 100, 1000, 10000])
+        features.append({
+            'account_age_days': rng.choice([0, 29, 30, 31, 90, 91, 180, 181, 365, 366, 2000]),
+            'follower_count': follower_count,
+            'following_count': following_count,
+            'follower_ratio': follower_ratio(follower_count, following_count),
+            'tweet_count': rng.randrange(10000),
+            'verified': rng.random() < 0.2,
+            'bio_length': rng.choice([0, 19, 20, 50, 51, 160]),
+            'bio_keywords': rng.choice([[], ['crypto'], ['defi', 'solana']]),
+            'avg_engagement': rng.choice([0, 0.99, 1, 10, 10.01, 50, 50.5, rng.random() * 100]),
+            'trusted_followers_count': rng.randrange(5),
+            'spam_indicators': rng.choice([[], ["Excessive promotional content"]])
+        })
+    return features
+
+@pytest.fixture(params=['numpy', 'python'])
+def scoring_backend(request, monkeypatch):
+    """Run a test with the NumPy path, when NumPy is installed, and with the pure Python fallback"""
+    if request.param == 'numpy':
+        if batch_scoring.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(batch_scoring, 'np', None)
+    return request.param
+
+def test_batch_scoring_matches_scalar_scoring(scoring_backend):
+    analyzer = AccountAnalyzer(x_client=None)
+    mismatches = find_mismatches(analyzer, boundary_features(20000))
+    assert mismatches == []
+
+def test_batch_scoring_keeps_spam_indicators(scoring_backend):
+    features = boundary_features(1)[0]
+    features['spam_indicators'] = ["High content repetition detected"]
+    _, risks, _ = score_features_batch([features])[0]
+    assert risks[-1] == "High content repetition detected"
+
+def test_empty_batch(scoring_backend):
+    assert score_features_batch([]) == []
@@ -0,0 +1,68 @@
+import random
+import pytest
+from fingerprint import (simhash, hamming_distance, bands, near_duplicate_groups, near_duplicate_ratio,
+                         to_signed, from_signed)
+from config import SIMHASH_NEAR_DUP_DISTANCE, SIMHASH_BANDS
+
+def reference_groups(fingerprints, max_distance):
+    """Connected components over every pair within max_distance bits, with no banding"""
+    parent = list(range(len(fingerprints)))
+
+    def find(item):
+        while parent[item] != item:
+            item = parent[item]
+        return item
+
+    for index in range(len(fingerprints)):
+        for other in range(index):
+            if hamming_distance(fingerprints[index], fingerprints[other]) <= max_distance:
+                parent[find(index)] = find(other)
+    return [find(index) for index in range(len(fingerprints))]
+
+def same_partition(a, b):
+    """Whether two group id lists split the items the same way, whatever the ids"""
+    return len(set(a)) == len(set(b)) == len(set(zip(a, b)))
+
+def test_near_duplicate_groups_match_all_pairs_reference():
+    rng = random.Random(7)
+    # Clusters of bit-flipped copies, so chains of near-duplicates bridge banding buckets
+    for _ in range(3000):
+        bases = [rng.getrandbits(64) for _ in range(rng.randint(1, 4))]
+        fingerprints = []
+        for _ in range(rng.randint(2, 25)):
+            fingerprint = rng.choice(bases)
+            for _ in range(rng.randint(0, 12)):
+                fingerprint ^= 1 << rng.randrange(64)
+            fingerprints.append(fingerprint)
+
+        expected = reference_groups(fingerprints, SIMHASH_NEAR_DUP_DISTANCE)
+        assert same_partition(near_duplicate_groups(fingerprints), expected), fingerprints
+
+def test_bands_cover_all_bits():
+    fingerprint = random.Random(1).getrandbits(64)
+    slices = bands(fingerprint, SIMHASH_BANDS)
+    assert len(slices) == SIMHASH_BANDS
+    rebuilt, offset = 0, 0
+    width, extra = divmod(64, SIMHASH_BANDS)
+    for index, value in enumerate(slices):
+        rebuilt |= value << offset
+        offset += width + (1 if index < extra else 0)
+    assert rebuilt == fingerprint
+
+def test_trivial_edits_stay_near():
+    text = "Airdrop live now, connect your wallet to claim"
+    edited = "Airdrop live now!! connect your wallet to claim https://t.co/abc @friend"
+    assert hamming_distance(simhash(text), simhash(edited)) <= SIMHASH_NEAR_DUP_DISTANCE
+    assert near_duplicate_ratio([text, edited]) == 0.5
+
+def test_tweets_without_content_only_repeat_identical_text():
+    # Media posts are bare t.co links; every one of them fingerprints to 0
+    texts = ["https://t.co/Ab12", "https://t.co/Cd34", "🚀🚀🚀", "🔥🔥", "Thread on our token economics"]
+    assert {simhash(text) for text in texts[:4]} == {0}
+    assert near_duplicate_ratio(texts) == 0.0
+    assert near_duplicate_ratio(["https://t.co/Ab12", "https://t.co/Ab12", "gm gm everyone"]) == pytest.approx(1 / 3)
+
+def test_signed_round_trip():
+    for fingerprint in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert -(1 << 63) <= to_signed(fingerprint) < 1 << 63
+        assert from_signed(to_signed(fingerprint)) == fingerprint
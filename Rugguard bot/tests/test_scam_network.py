@@ -0,0 +1,41 @@
+from storage import get_storage
+from fingerprint import simhash, to_signed
+from scam_network import ScamNetworkIndex, index_bands
+from config import DATABASE_PATH
+
+SHILL = "Huge airdrop live now, claim your free tokens before it ends https://t.co/abc"
+COPY = "Huge airdrop live now!! Claim your free tokens before it ends https://t.co/xyz @friend"
+
+def store_tweet(storage, tweet_id, user_id, text, score):
+    fingerprint = simhash(text)
+    with storage.transaction() as conn:
+        conn.execute('''
+            INSERT INTO tweet_fingerprints (tweet_id, user_id, simhash, band0, band1, band2, band3)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (tweet_id, user_id, to_signed(fingerprint), *(index_bands(text, fingerprint) or (None,) * 4)))
+        conn.execute(
+            "INSERT INTO analysis_results (user_id, username, trustworthiness_score) VALUES (?, ?, ?)",
+            (user_id, f"account{user_id}", score)
+        )
+
+def lookup(index, text):
+    fingerprint = simhash(text)
+    return index.matching_accounts('new', [(fingerprint, index_bands(text, fingerprint))])
+
+def test_finds_copies_from_high_risk_accounts_only():
+    storage = get_storage(DATABASE_PATH)
+    store_tweet(storage, 1, 'risky', SHILL, 20)
+    store_tweet(storage, 2, 'trusted', "Reading through the latest Solana validator docs tonight", 80)
+    index = ScamNetworkIndex(DATABASE_PATH)
+
+    assert lookup(index, COPY) == ['risky']
+    assert lookup(index, "Reading through the latest Solana validator docs tonight!") == []
+    assert lookup(index, "Thread on how we designed our token economics") == []
+
+def test_ignores_the_account_itself_and_short_tweets():
+    storage = get_storage(DATABASE_PATH)
+    store_tweet(storage, 1, 'new', SHILL, 20)
+    index = ScamNetworkIndex(DATABASE_PATH)
+
+    assert lookup(index, COPY) == []
+    assert index_bands("gm", simhash("gm")) is None
@@ -0,0 +1,36 @@
+import random
+from text_matcher import TermMatcher
+from fake_x_api import TWEET_TEMPLATES
+from config import BIO_KEYWORDS, PROMO_TERMS
+
+def random_terms(rng, count):
+    return list(dict.fromkeys(
+        ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 8)))
+        for _ in range(count)
+    ))
+
+def test_matches_substring_search_for_random_vocabularies():
+    rng = random.Random(5)
+    texts = [rng.choice(TWEET_TEMPLATES) + ' ' + rng.choice(TWEET_TEMPLATES) for _ in range(200)]
+    for term_count in (16, 500):
+        terms = random_terms(rng, term_count)
+        matcher = TermMatcher(terms)
+        for text in texts:
+            assert matcher.find_all(text) == [term for term in terms if term in text.lower()], text
+
+def test_finds_overlapping_and_nested_terms_in_configured_order():
+    matcher = TermMatcher(['moon', 'mo', 'on', 'pump'])
+    assert matcher.find_all("To the MOON and pump") == ['moon', 'mo', 'on', 'pump']
+    # A term that is a prefix of another must still match on its own
+    assert matcher.find_all("in mode") == ['mo']
+
+def test_configured_keyword_lists():
+    for terms in (BIO_KEYWORDS, PROMO_TERMS):
+        matcher = TermMatcher(terms)
+        for text in TWEET_TEMPLATES:
+            assert matcher.find_all(text) == [term.lower() for term in terms if term.lower() in text.lower()]
+
+def test_empty_inputs():
+    assert TermMatcher([]).find_all("anything") == []
+    assert TermMatcher(['gem']).find_all('') == []
+    assert not TermMatcher(['gem']).contains_any("nothing here")
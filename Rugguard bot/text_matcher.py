@@ -0,0 +1,50 @@
+import re
+
+def _trie_pattern(node):
+    """Regex for a character trie; shared prefixes are matched once, and the longest term wins"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # '' marks the end of a term; deeper matches are optional past it
+    return f'(?:{body})?' if '' in node else body
+
+class TermMatcher:
+    """Finds every configured term occurring anywhere in a text with a single regex scan"""
+
+    def __init__(self, terms):
+        self.terms = list(dict.fromkeys(term.lower() for term in terms if term))
+        self._order = {term: index for index, term in enumerate(self.terms)}
+        # The scan reports the longest term starting at each position; shorter terms
+        # that are prefixes of it occur there too
+        self._prefixes = {
+            term: [other for other in self.terms if term.startswith(other)]
+            for term in self.terms
+        }
+
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        # A zero-width lookahead lets matches overlap, so terms inside other terms are found
+        self._pattern = re.compile(f'(?=({_trie_pattern(trie)}))') if self.terms else None
+
+    def find_all(self, text):
+        """Return the terms found in text as substrings, in configured order"""
+        if not text or self._pattern is None:
+            return []
+
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            found.update(self._prefixes[match.group(1)])
+            if len(found) == len(self.terms):
+                break
+        return sorted(found, key=self._order.__getitem__)
+
+    def contains_any(self, text):
+        """Whether any term occurs in text"""
+        if not text or self._pattern is None:
+            return False
+        return self._pattern.search(text.lower()) is not None
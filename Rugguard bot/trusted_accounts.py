@@ -1,60 +1,150 @@
 import requests
-import sqlite3
 import logging
+import os
+import threading
+import time
 from datetime import datetime, timedelta
-from config import TRUSTED_ACCOUNTS_URL, DATABASE_PATH
+from storage import get_storage
+from rate_limiter import RateLimitDeferred
+from config import (TRUSTED_ACCOUNTS_URL, DATABASE_PATH, TRUSTED_ACCOUNTS_REFRESH_SECONDS, TRUSTED_FOLLOWERS_TARGET,
+                    TRUSTED_ACCOUNTS_CHECK_HOURS, TRUSTED_ACCOUNTS_BACKUP_PATH)
+
+# bot_state keys for conditional refreshes of the list
+STATE_ETAG = 'trusted_accounts_etag'
+STATE_LAST_MODIFIED = 'trusted_accounts_last_modified'
+STATE_CHECKED = 'trusted_accounts_checked'  # updated_date is when the list was last confirmed current
 
 class TrustedAccountsManager:
     def __init__(self):
         self.db_path = DATABASE_PATH
+        self.storage = get_storage(self.db_path)
         self.trusted_accounts_url = TRUSTED_ACCOUNTS_URL
+        self.backup_path = TRUSTED_ACCOUNTS_BACKUP_PATH
         self.logger = logging.getLogger(__name__)
+        self.refresh_seconds = TRUSTED_ACCOUNTS_REFRESH_SECONDS
+        self._trusted_set = frozenset()
+        self._trusted_set_loaded_at = None
+        self._trusted_set_lock = threading.Lock()
     
     def fetch_trusted_accounts(self):
-        """Fetch trusted accounts list from GitHub"""
+        """Fetch trusted accounts list from GitHub; returns (accounts, validators), accounts is None if unchanged"""
         try:
-            response = requests.get(self.trusted_accounts_url, timeout=10)
+            headers = {}
+            # Validators are only useful while the table still holds the list they describe
+            if self.storage.fetchvalue("SELECT COUNT(*) FROM trusted_accounts", default=0):
+                etag = self._get_state(STATE_ETAG)
+                last_modified = self._get_state(STATE_LAST_MODIFIED)
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            response = requests.get(self.trusted_accounts_url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                self.logger.info("Trusted accounts list unchanged")
+                return None, {}
             response.raise_for_status()
             
-            accounts = []
-            for line in response.text.strip().split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Remove @ symbol if present
-                    username = line.replace('@', '').lower()
-                    accounts.append(username)
+            accounts = self._parse_accounts(response.text)
+            if accounts:
+                self._save_backup(response.text)
             
             self.logger.info(f"Fetched {len(accounts)} trusted accounts")
-            return accounts
+            validators = {
+                STATE_ETAG: response.headers.get('ETag'),
+                STATE_LAST_MODIFIED: response.headers.get('Last-Modified')
+            }
+            return accounts, validators
             
         except Exception as e:
             self.logger.error(f"Error fetching trusted accounts: {e}")
+            return [], {}
+    
+    def _parse_accounts(self, text):
+        """Normalized usernames from the list file, skipping blanks and comments"""
+        accounts = []
+        for line in text.strip().split('\n'):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                # Remove @ symbol if present
+                username = line.replace('@', '').lower()
+                accounts.append(username)
+        return accounts
+    
+    def _save_backup(self, text):
+        """Keep the last good list on disk, replacing it atomically"""
+        try:
+            temp_path = self.backup_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, self.backup_path)
+        except Exception as e:
+            self.logger.error(f"Error saving trusted accounts backup: {e}")
+    
+    def _load_backup(self):
+        """Accounts from the last good list on disk, or [] if there is none"""
+        try:
+            with open(self.backup_path, 'r', encoding='utf-8') as f:
+                return self._parse_accounts(f.read())
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            self.logger.error(f"Error loading trusted accounts backup: {e}")
             return []
     
+    def _get_state(self, key):
+        return self.storage.fetchvalue("SELECT value FROM bot_state WHERE key = ?", (key,))
+    
     def update_trusted_accounts_cache(self):
         """Update local cache of trusted accounts"""
-        accounts = self.fetch_trusted_accounts()
-        if not accounts:
-            return False
+        accounts, validators = self.fetch_trusted_accounts()
+        from_backup = False
+        if accounts is not None and not accounts:
+            # Fall back to the last good copy only when there is nothing cached to keep serving
+            if self.storage.fetchvalue("SELECT COUNT(*) FROM trusted_accounts", default=0):
+                return False
+            accounts = self._load_backup()
+            if not accounts:
+                return False
+            from_backup = True
+            self.logger.warning(f"Loaded {len(accounts)} trusted accounts from {self.backup_path}")
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Clear existing cache
-            cursor.execute("DELETE FROM trusted_accounts")
+            with self.storage.transaction() as conn:
+                added = removed = ()
+                if accounts is not None:
+                    # Apply only the differences so readers never see a partial or empty list
+                    new = set(accounts)
+                    existing = {row[0] for row in conn.execute("SELECT username FROM trusted_accounts")}
+                    added = new - existing
+                    removed = existing - new
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO trusted_accounts (username) VALUES (?)",
+                        [(username,) for username in sorted(added)]
+                    )
+                    conn.executemany(
+                        "DELETE FROM trusted_accounts WHERE username = ?",
+                        [(username,) for username in sorted(removed)]
+                    )
+                
+                # A backup copy is not a successful check, so the next call tries the network again
+                if not from_backup:
+                    state = dict(validators)
+                    state[STATE_CHECKED] = 'ok'
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO bot_state (key, value, updated_date) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                        [(key, value) for key, value in state.items() if value]
+                    )
+                    conn.executemany(
+                        "DELETE FROM bot_state WHERE key = ?",
+                        [(key,) for key, value in state.items() if not value]
+                    )
             
-            # Insert new accounts
-            for username in accounts:
-                cursor.execute(
-                    "INSERT INTO trusted_accounts (username) VALUES (?)",
-                    (username,)
+            if added or removed:
+                self.logger.info(
+                    f"Updated trusted accounts cache: {len(added)} added, {len(removed)} removed"
                 )
-            
-            conn.commit()
-            conn.close()
-            
-            self.logger.info(f"Updated trusted accounts cache with {len(accounts)} accounts")
+                self.invalidate_trusted_set()
             return True
             
         except Exception as e:
@@ -64,45 +154,70 @@ class TrustedAccountsManager:
     def get_trusted_accounts(self):
         """Get trusted accounts from cache, update if needed"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if cache needs update (older than 24 hours)
-            cursor.execute(
-                "SELECT COUNT(*) FROM trusted_accounts WHERE last_updated > datetime('now', '-24 hours')"
+            # Check whether the list was confirmed current within the refresh window
+            recent = self.storage.fetchone(
+                "SELECT 1 FROM bot_state WHERE key = ? AND updated_date > datetime('now', ?)",
+                (STATE_CHECKED, f'-{int(TRUSTED_ACCOUNTS_CHECK_HOURS)} hours')
             )
-            recent_count = cursor.fetchone()[0]
             
-            if recent_count == 0:
-                conn.close()
+            if recent is None:
                 self.update_trusted_accounts_cache()
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
             
             # Get all trusted accounts
-            cursor.execute("SELECT username FROM trusted_accounts")
-            accounts = [row[0] for row in cursor.fetchall()]
-            
-            conn.close()
-            return accounts
+            rows = self.storage.fetchall("SELECT username FROM trusted_accounts")
+            return [row[0] for row in rows]
             
         except Exception as e:
             self.logger.error(f"Error getting trusted accounts: {e}")
             return []
     
+    def get_trusted_set(self):
+        """Get the normalized trusted usernames as a frozenset, reloading after the TTL"""
+        with self._trusted_set_lock:
+            loaded_at = self._trusted_set_loaded_at
+            if loaded_at is None or time.monotonic() - loaded_at >= self.refresh_seconds:
+                accounts = self.get_trusted_accounts()
+                # Keep serving the previous set if the reload came back empty
+                if accounts or loaded_at is None:
+                    self._trusted_set = frozenset(a.lower().lstrip('@') for a in accounts)
+                self._trusted_set_loaded_at = time.monotonic()
+            return self._trusted_set
+    
+    def invalidate_trusted_set(self):
+        """Force the in-memory trusted set to reload on next use"""
+        self._trusted_set_loaded_at = None
+    
     def check_trusted_followers(self, user_followers, min_count=2):
         """Check if user is followed by trusted accounts"""
-        trusted_accounts = self.get_trusted_accounts()
+        trusted_accounts = self.get_trusted_set()
         if not trusted_accounts:
             return 0, []
         
-        # Convert follower usernames to lowercase for comparison
-        follower_usernames = [f.lower() for f in user_followers]
-        
-        # Find intersection
-        trusted_followers = []
-        for trusted in trusted_accounts:
-            if trusted.lower() in follower_usernames:
-                trusted_followers.append(trusted)
+        # Hash-set intersection against lowercased follower usernames
+        trusted_followers = sorted(trusted_accounts.intersection(f.lower() for f in user_followers))
         
         return len(trusted_followers), trusted_followers
+    
+    def find_trusted_followers(self, follower_pages, target=TRUSTED_FOLLOWERS_TARGET):
+        """Match follower pages against the trusted set as they arrive, stopping once target are found;
+        returns (trusted followers, whether the scan finished rather than being cut off)"""
+        trusted_accounts = self.get_trusted_set()
+        if not trusted_accounts:
+            # More likely a failed list refresh than an empty list
+            return [], False
+        
+        # Pages are only fetched as the loop asks for them, so stopping early saves API calls
+        trusted_followers = set()
+        try:
+            for page in follower_pages:
+                trusted_followers.update(trusted_accounts.intersection(f.lower() for f in page))
+                if len(trusted_followers) >= target:
+                    break
+        except RateLimitDeferred as e:
+            self.logger.info(f"Follower scan deferred with {len(trusted_followers)} trusted followers found: {e}")
+            return sorted(trusted_followers), False
+        except Exception as e:
+            self.logger.error(f"Error scanning followers for trusted accounts: {e}")
+            return sorted(trusted_followers), False
+        
+        return sorted(trusted_followers), True
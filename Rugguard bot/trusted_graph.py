@@ -0,0 +1,214 @@
+"""
+Trusted graph index for RUGGUARD Bot
+A background job pages through the following list of every trusted account and stores it
+inverted, keyed by the followed user_id, so an analysis finds its trusted followers with one
+indexed lookup instead of walking the target's followers
+"""
+
+import logging
+import threading
+from storage import get_storage
+from rate_limiter import PRIORITY_LOW
+from x_api_client import PageLimitReached
+from config import *
+
+class TrustedGraphIndex:
+    """Inverted trusted-following index with an incremental background sync"""
+
+    def __init__(self, x_client, trusted_manager, db_path=DATABASE_PATH,
+                 refresh_hours=TRUSTED_GRAPH_REFRESH_HOURS, accounts_per_run=TRUSTED_GRAPH_ACCOUNTS_PER_RUN):
+        self.x_client = x_client
+        self.trusted_manager = trusted_manager
+        self.storage = get_storage(db_path)
+        self.refresh_hours = refresh_hours
+        self.accounts_per_run = accounts_per_run
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def trusted_followers(self, user_id):
+        """Return (trusted accounts following user_id, whether the index covers every trusted account)"""
+        trusted_accounts = self.trusted_manager.get_trusted_set()
+        if not trusted_accounts:
+            return [], False
+
+        try:
+            rows = self.storage.fetchall(
+                "SELECT trusted_username FROM trusted_following WHERE user_id = ?", (str(user_id),)
+            )
+            # Accounts that don't exist follow nobody; truncated lists may be missing follows
+            covered = self.storage.fetchall('''
+                SELECT trusted_username FROM trusted_following_sync
+                WHERE (synced_date IS NOT NULL AND truncated = 0) OR not_found = 1
+            ''')
+        except Exception as e:
+            self.logger.error(f"Error reading trusted following index: {e}")
+            return [], False
+
+        # Accounts dropped from the trusted list stay in the index until the next sync removes them
+        trusted_followers = sorted(trusted_accounts.intersection(row[0] for row in rows))
+        complete = trusted_accounts.issubset(row[0] for row in covered)
+        return trusted_followers, complete
+
+    def accounts_due(self):
+        """Trusted accounts never synced or last attempted longer ago than the refresh window, oldest first"""
+        trusted_accounts = self.trusted_manager.get_trusted_set()
+        # Truncated and not-found accounts also wait out the window instead of retrying every run
+        fresh = {
+            row[0] for row in self.storage.fetchall('''
+                SELECT trusted_username FROM trusted_following_sync
+                WHERE attempted_date > datetime('now', ?)
+            ''', (f'-{int(self.refresh_hours)} hours',))
+        }
+        last_synced = {
+            row[0]: row[1] for row in self.storage.fetchall(
+                "SELECT trusted_username, attempted_date FROM trusted_following_sync"
+            )
+        }
+        due = [username for username in trusted_accounts if username not in fresh]
+        # Never-synced accounts sort first (empty string), then by last sync time
+        due.sort(key=lambda username: (last_synced.get(username) or '', username))
+        return due[:self.accounts_per_run]
+
+    def remove_untrusted(self):
+        """Drop index rows for accounts no longer on the trusted list; returns how many accounts were removed"""
+        trusted_accounts = self.trusted_manager.get_trusted_set()
+        if not trusted_accounts:
+            # An empty list is more likely a failed refresh than an emptied list
+            return 0
+
+        indexed = [row[0] for row in self.storage.fetchall("SELECT trusted_username FROM trusted_following_sync")]
+        removed = [username for username in indexed if username not in trusted_accounts]
+        if removed:
+            with self.storage.transaction() as conn:
+                conn.executemany("DELETE FROM trusted_following WHERE trusted_username = ?", [(u,) for u in removed])
+                conn.executemany("DELETE FROM trusted_following_sync WHERE trusted_username = ?", [(u,) for u in removed])
+        return len(removed)
+
+    def _resolve_user_ids(self, usernames):
+        """Map trusted usernames to user ids, looking up only the ones not stored yet"""
+        stored = {
+            row[0]: row[1] for row in self.storage.fetchall(
+                "SELECT trusted_username, trusted_user_id FROM trusted_following_sync WHERE trusted_user_id IS NOT NULL"
+            )
+        }
+        missing = [username for username in usernames if username not in stored]
+        if missing:
+            not_found = set()
+            users = self.x_client.get_users_info(missing, priority=PRIORITY_LOW, not_found=not_found)
+            found = [(username, str(users[username]['id'])) for username in missing if username in users]
+            self.storage.executemany('''
+                INSERT INTO trusted_following_sync (trusted_username, trusted_user_id) VALUES (?, ?)
+                ON CONFLICT(trusted_username) DO UPDATE SET trusted_user_id = excluded.trusted_user_id, not_found = 0
+            ''', found)
+            stored.update(found)
+            
+            # Only names the API reported as nonexistent; failed lookups are simply retried next run
+            gone = [(username,) for username in missing if username in not_found]
+            if gone:
+                self.logger.warning(f"Trusted accounts not found on X: {[username for username, in gone]}")
+                self.storage.executemany('''
+                    INSERT INTO trusted_following_sync (trusted_username, not_found, attempted_date)
+                    VALUES (?, 1, CURRENT_TIMESTAMP)
+                    ON CONFLICT(trusted_username) DO UPDATE SET not_found = 1, attempted_date = CURRENT_TIMESTAMP
+                ''', gone)
+        return stored
+
+    def sync_account(self, username, trusted_user_id):
+        """Re-read one trusted account's following list; returns accounts indexed, or None if interrupted.
+        A list longer than the page budget is indexed as far as it goes but never counts as complete."""
+        generation = self.storage.fetchvalue(
+            "SELECT generation FROM trusted_following_sync WHERE trusted_username = ?", (username,), default=0
+        ) + 1
+        # Claim the generation first so rows written by an interrupted pass are cleaned up by a later one
+        self.storage.execute(
+            "UPDATE trusted_following_sync SET generation = ? WHERE trusted_username = ?", (generation, username)
+        )
+
+        indexed = 0
+        truncated = False
+        try:
+            # Each page is written as it arrives, so memory stays flat for accounts following many others
+            for page in self.x_client.iter_following_pages(trusted_user_id):
+                self.storage.executemany('''
+                    INSERT INTO trusted_following (user_id, trusted_username, generation) VALUES (?, ?, ?)
+                    ON CONFLICT(user_id, trusted_username) DO UPDATE SET generation = excluded.generation
+                ''', [(user_id, username, generation) for user_id, _ in page])
+                indexed += len(page)
+        except PageLimitReached as e:
+            truncated = True
+            self.logger.warning(
+                f"Following list of @{username} is longer than TRUSTED_GRAPH_MAX_PAGES allows ({e}); "
+                f"indexed {indexed} accounts, follower scans stay on"
+            )
+        except Exception as e:
+            self.logger.info(f"Trusted graph sync of @{username} interrupted after {indexed} accounts: {e}")
+            return None
+
+        if truncated:
+            # Unread pages may hold follows from older passes, so nothing is deleted
+            self.storage.execute('''
+                UPDATE trusted_following_sync
+                SET truncated = 1, attempted_date = CURRENT_TIMESTAMP
+                WHERE trusted_username = ?
+            ''', (username,))
+            return indexed
+
+        # Complete pass: rows not seen this time are unfollows
+        with self.storage.transaction() as conn:
+            conn.execute(
+                "DELETE FROM trusted_following WHERE trusted_username = ? AND generation < ?", (username, generation)
+            )
+            conn.execute('''
+                UPDATE trusted_following_sync
+                SET following_count = ?, truncated = 0,
+                    synced_date = CURRENT_TIMESTAMP, attempted_date = CURRENT_TIMESTAMP
+                WHERE trusted_username = ?
+            ''', (indexed, username))
+        return indexed
+
+    def run_once(self):
+        """Sync the trusted accounts that are due; returns {username: accounts indexed}"""
+        synced = {}
+        try:
+            removed = self.remove_untrusted()
+            if removed:
+                self.logger.info(f"Removed {removed} untrusted accounts from the trusted graph")
+
+            due = self.accounts_due()
+            if not due:
+                return synced
+
+            user_ids = self._resolve_user_ids(due)
+            for username in due:
+                if self._stop.is_set():
+                    break
+                if username not in user_ids:
+                    # Not found accounts were recorded; other lookup failures are retried next run
+                    continue
+                count = self.sync_account(username, user_ids[username])
+                if count is None:
+                    # Out of budget; the remaining accounts are still due on the next wake-up
+                    break
+                synced[username] = count
+        except Exception as e:
+            self.logger.error(f"Error syncing trusted graph: {e}")
+
+        if synced:
+            self.logger.info(f"🔗 Synced trusted following lists: {synced}")
+        return synced
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(interval)
+
+    def start(self, interval=TRUSTED_GRAPH_SYNC_INTERVAL_SECONDS):
+        """Sync on a daemon thread now and then every `interval` seconds"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='trusted-graph-sync', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -1,14 +1,49 @@
 import tweepy
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
+from x_transport import install_transport, X_API_HOST
+from rate_limiter import RateLimiter, RateLimitDeferred, PRIORITY_HIGH, PRIORITY_LOW
+from metrics import API_CALLS, API_CALL_DURATION, RATE_LIMIT_DEFERRALS, time_stage, timed_stage
 from config import *
 
+USER_FIELDS = ['created_at', 'description', 'public_metrics', 'verified']
+
+class PageLimitReached(Exception):
+    """Raised when a paged listing still has pages left after its page budget is spent"""
+
+    def __init__(self, endpoint, max_pages):
+        super().__init__(f"{endpoint} has more than {max_pages} pages")
+        self.endpoint = endpoint
+        self.max_pages = max_pages
+
+class RateLimitAwareClient(tweepy.Client):
+    """tweepy v2 client that remembers the headers of the last response on each thread"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+    
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        self._local.headers = None
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.HTTPException as e:
+            self._local.headers = e.response.headers
+            raise
+        self._local.headers = response.headers
+        return response
+    
+    @property
+    def last_response_headers(self):
+        return getattr(self._local, 'headers', None)
+
 class XAPIClient:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.rate_limit_tracker = RateLimiter()
         self.setup_api()
-        self.rate_limit_tracker = {}
     
     def setup_api(self):
         """Initialize Twitter API clients"""
@@ -18,16 +53,21 @@ class XAPIClient:
             auth.set_access_token(X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET)
             self.api_v1 = tweepy.API(auth, wait_on_rate_limit=True)
             
-            # API v2 client for advanced features
-            self.api_v2 = tweepy.Client(
+            # API v2 client for advanced features; rate limits are scheduled by
+            # rate_limit_tracker instead of blocking the whole process
+            self.api_v2 = RateLimitAwareClient(
                 bearer_token=X_BEARER_TOKEN,
                 consumer_key=X_API_KEY,
                 consumer_secret=X_API_SECRET,
                 access_token=X_ACCESS_TOKEN,
                 access_token_secret=X_ACCESS_TOKEN_SECRET,
-                wait_on_rate_limit=True
+                wait_on_rate_limit=False
             )
             
+            # Route requests through an offline transport when one is configured
+            if install_transport(self.api_v1.session, self.api_v2.session):
+                self.logger.info(f"Using alternate X API transport instead of {X_API_HOST}")
+            
             # Test authentication
             self.api_v1.verify_credentials()
             self.logger.info("X API authentication successful")
@@ -36,45 +76,117 @@ class XAPIClient:
             self.logger.error(f"X API authentication failed: {e}")
             raise
     
+    def can_call(self, endpoint, priority=PRIORITY_HIGH):
+        """Check whether an endpoint has budget for a call right now"""
+        return self.rate_limit_tracker.can_call(endpoint, priority)
+    
+    def time_until_available(self, endpoint, priority=PRIORITY_HIGH, calls=1):
+        """Seconds until an endpoint has budget for `calls` calls; endpoint None checks the hourly budget"""
+        return self.rate_limit_tracker.time_until_available(endpoint, priority, calls)
+    
+    def available_calls(self, endpoint, priority=PRIORITY_HIGH):
+        """Calls an endpoint can make right now, or None if its limit is not known yet;
+        endpoint None counts the hourly low-priority budget alone"""
+        return self.rate_limit_tracker.available_tokens(endpoint, priority)
+    
+    def _call(self, endpoint, method, *args, priority=PRIORITY_HIGH, **kwargs):
+        """Call an API v2 method once the rate limiter grants a token"""
+        if not self.rate_limit_tracker.acquire(endpoint, priority=priority):
+            RATE_LIMIT_DEFERRALS.inc(endpoint=endpoint)
+            API_CALLS.inc(endpoint=endpoint, outcome='deferred')
+            raise RateLimitDeferred(endpoint, self.rate_limit_tracker.time_until_available(endpoint, priority))
+        
+        outcome = 'error'
+        try:
+            with API_CALL_DURATION.time(endpoint=endpoint):
+                response = method(*args, **kwargs)
+            outcome = 'ok'
+            return response
+        finally:
+            API_CALLS.inc(endpoint=endpoint, outcome=outcome)
+            headers = self.api_v2.last_response_headers
+            if headers:
+                self.rate_limit_tracker.update_from_headers(endpoint, headers)
+    
+    @timed_stage('user_info')
     def get_user_info(self, username):
         """Get detailed user information"""
         try:
-            user = self.api_v2.get_user(
+            user = self._call(
+                'get_user',
+                self.api_v2.get_user,
                 username=username,
-                user_fields=['created_at', 'description', 'public_metrics', 'verified']
+                user_fields=USER_FIELDS
             )
             
             if not user.data:
                 return None
             
-            user_data = user.data
-            metrics = user_data.public_metrics
-            
-            # Calculate account age
-            created_at = user_data.created_at
-            account_age = (datetime.now(created_at.tzinfo) - created_at).days
-            
-            return {
-                'id': user_data.id,
-                'username': user_data.username,
-                'name': user_data.name,
-                'description': user_data.description or '',
-                'created_at': created_at,
-                'account_age_days': account_age,
-                'followers_count': metrics['followers_count'],
-                'following_count': metrics['following_count'],
-                'tweet_count': metrics['tweet_count'],
-                'verified': getattr(user_data, 'verified', False)
-            }
+            return self._parse_user(user.data)
             
         except Exception as e:
             self.logger.error(f"Error getting user info for {username}: {e}")
             return None
     
+    @timed_stage('user_info')
+    def get_users_info(self, usernames, priority=PRIORITY_HIGH, not_found=None):
+        """Get user information for many usernames, up to 100 per request; names the API reports
+        as nonexistent are added to the optional not_found set"""
+        usernames = list(dict.fromkeys(u.lstrip('@').lower() for u in usernames))
+        users = {}
+        
+        for start in range(0, len(usernames), USER_LOOKUP_BATCH_SIZE):
+            batch = usernames[start:start + USER_LOOKUP_BATCH_SIZE]
+            try:
+                response = self._call(
+                    'get_users',
+                    self.api_v2.get_users,
+                    priority=priority,
+                    usernames=batch,
+                    user_fields=USER_FIELDS
+                )
+                
+                for user_data in response.data or []:
+                    users[user_data.username.lower()] = self._parse_user(user_data)
+                if not_found is not None:
+                    not_found.update(
+                        str(error.get('value', '')).lower() for error in response.errors or []
+                        if error.get('title') == 'Not Found Error'
+                    )
+                
+            except Exception as e:
+                self.logger.error(f"Error getting user info for {len(batch)} users: {e}")
+        
+        return users
+    
+    def _parse_user(self, user_data):
+        """Convert a v2 user object into the user info dict used by the analyzer"""
+        metrics = user_data.public_metrics
+        
+        # Calculate account age
+        created_at = user_data.created_at
+        account_age = (datetime.now(created_at.tzinfo) - created_at).days
+        
+        return {
+            'id': user_data.id,
+            'username': user_data.username,
+            'name': user_data.name,
+            'description': user_data.description or '',
+            'created_at': created_at,
+            'account_age_days': account_age,
+            'followers_count': metrics['followers_count'],
+            'following_count': metrics['following_count'],
+            'tweet_count': metrics['tweet_count'],
+            'verified': getattr(user_data, 'verified', False)
+        }
+    
+    @timed_stage('tweets')
     def get_user_tweets(self, user_id, max_results=10):
         """Get recent tweets from user"""
         try:
-            tweets = self.api_v2.get_users_tweets(
+            tweets = self._call(
+                'get_users_tweets',
+                self.api_v2.get_users_tweets,
                 id=user_id,
                 max_results=max_results,
                 tweet_fields=['created_at', 'public_metrics', 'context_annotations']
@@ -102,24 +214,79 @@ class XAPIClient:
             self.logger.error(f"Error getting tweets for user {user_id}: {e}")
             return []
     
-    def get_user_followers(self, user_id, max_results=100):
-        """Get user's followers (limited by API)"""
+    def iter_follower_pages(self, user_id, page_size=FOLLOWER_PAGE_SIZE, max_pages=FOLLOWER_MAX_PAGES):
+        """Yield pages of follower usernames, requesting each page only when the previous one is consumed;
+        deferrals and errors are raised so callers know the scan is incomplete"""
+        pages = self._iter_user_pages(
+            'get_users_followers', self.api_v2.get_users_followers, 'followers', user_id, page_size, max_pages
+        )
         try:
-            followers = self.api_v2.get_users_followers(
-                id=user_id,
-                max_results=max_results,
+            for users in pages:
+                yield [user.username for user in users]
+        except PageLimitReached:
+            # The follower page budget is a deliberate cap, not a failure
+            return
+    
+    def iter_following_pages(self, user_id, page_size=FOLLOWING_PAGE_SIZE, max_pages=TRUSTED_GRAPH_MAX_PAGES):
+        """Yield pages of (user id, username) the user follows; deferrals, errors and PageLimitReached
+        are raised to the caller"""
+        pages = self._iter_user_pages(
+            'get_users_following', self.api_v2.get_users_following, 'following', user_id, page_size, max_pages
+        )
+        for users in pages:
+            yield [(str(user.id), user.username) for user in users]
+    
+    def _iter_user_pages(self, endpoint, method, stage, user_id, page_size, max_pages):
+        """Page through a user list endpoint at low priority, yielding each page's users;
+        raises PageLimitReached if max_pages run out before the list does"""
+        pagination_token = None
+        for _ in range(max_pages):
+            # Paging is deferred rather than competing with replies for budget
+            with time_stage(stage):
+                response = self._call(
+                    endpoint,
+                    method,
+                    priority=PRIORITY_LOW,
+                    id=user_id,
+                    max_results=page_size,
+                    pagination_token=pagination_token,
+                    user_fields=['username']
+                )
+            
+            if response.data:
+                yield response.data
+            
+            pagination_token = (response.meta or {}).get('next_token')
+            if not pagination_token:
+                return
+        
+        raise PageLimitReached(endpoint, max_pages)
+    
+    def get_tweet_author(self, tweet_id):
+        """Get the author of a tweet"""
+        try:
+            tweet = self._call(
+                'get_tweet',
+                self.api_v2.get_tweet,
+                tweet_id,
+                expansions=['author_id'],
                 user_fields=['username']
             )
             
-            if not followers.data:
-                return []
+            if not tweet.data or not tweet.includes.get('users'):
+                return None
             
-            return [follower.username for follower in followers.data]
+            author = tweet.includes['users'][0]
+            return {
+                'user_id': author.id,
+                'username': author.username
+            }
             
         except Exception as e:
-            self.logger.error(f"Error getting followers for user {user_id}: {e}")
-            return []
+            self.logger.error(f"Error getting author of tweet {tweet_id}: {e}")
+            return None
     
+    @timed_stage('reply_post')
     def reply_to_tweet(self, tweet_id, message):
         """Reply to a specific tweet"""
         try:
@@ -127,7 +294,9 @@ class XAPIClient:
             if len(message) > 280:
                 message = message[:277] + "..."
             
-            response = self.api_v2.create_tweet(
+            response = self._call(
+                'create_tweet',
+                self.api_v2.create_tweet,
                 text=message,
                 in_reply_to_tweet_id=tweet_id
             )
@@ -139,32 +308,70 @@ class XAPIClient:
             self.logger.error(f"Error replying to tweet {tweet_id}: {e}")
             return None
     
-    def search_mentions(self, query, max_results=10):
-        """Search for mentions and replies"""
+    @timed_stage('search')
+    def search_mentions(self, query, max_results=10, since_id=None, until_id=None, max_pages=1):
+        """Search for mentions and replies older than until_id, paging back to since_id when given;
+        returns (tweets newest first, whether every page was read)"""
+        results = []
+        next_token = None
+        
         try:
-            tweets = self.api_v2.search_recent_tweets(
-                query=query,
-                max_results=max_results,
-                tweet_fields=['created_at', 'author_id', 'in_reply_to_user_id', 'referenced_tweets'],
-                expansions=['author_id', 'referenced_tweets.id']
-            )
+            for _ in range(max_pages):
+                tweets = self._call(
+                    'search_recent_tweets',
+                    self.api_v2.search_recent_tweets,
+                    query=query,
+                    max_results=max_results,
+                    since_id=since_id,
+                    until_id=until_id,
+                    next_token=next_token,
+                    tweet_fields=['created_at', 'author_id', 'in_reply_to_user_id', 'referenced_tweets'],
+                    user_fields=['username'],
+                    expansions=['author_id', 'referenced_tweets.id', 'referenced_tweets.id.author_id']
+                )
+                
+                # Index the expanded referenced tweets and users for this page
+                includes = tweets.includes or {}
+                included_tweets = {tweet.id: tweet for tweet in includes.get('tweets', [])}
+                included_users = {user.id: user for user in includes.get('users', [])}
+                
+                for tweet in tweets.data or []:
+                    referenced_tweets = getattr(tweet, 'referenced_tweets', None) or []
+                    results.append({
+                        'id': tweet.id,
+                        'text': tweet.text,
+                        'author_id': tweet.author_id,
+                        'created_at': tweet.created_at,
+                        'in_reply_to_user_id': getattr(tweet, 'in_reply_to_user_id', None),
+                        'referenced_tweets': referenced_tweets,
+                        'replied_to_author': self._replied_to_author(
+                            referenced_tweets, included_tweets, included_users
+                        )
+                    })
+                
+                next_token = (tweets.meta or {}).get('next_token')
+                if not next_token:
+                    return results, True
             
-            if not tweets.data:
-                return []
-            
-            results = []
-            for tweet in tweets.data:
-                results.append({
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'author_id': tweet.author_id,
-                    'created_at': tweet.created_at,
-                    'in_reply_to_user_id': getattr(tweet, 'in_reply_to_user_id', None),
-                    'referenced_tweets': getattr(tweet, 'referenced_tweets', [])
-                })
-            
-            return results
+            self.logger.warning(f"Search stopped after {max_pages} pages with more results pending")
+            return results, False
             
         except Exception as e:
             self.logger.error(f"Error searching mentions: {e}")
-            return []
+            return [], False
+    
+    def _replied_to_author(self, referenced_tweets, included_tweets, included_users):
+        """Resolve the author of the replied-to tweet from search expansions"""
+        for ref in referenced_tweets:
+            if ref['type'] != 'replied_to':
+                continue
+            
+            original = included_tweets.get(ref['id'])
+            author = included_users.get(original.author_id) if original else None
+            if author:
+                return {
+                    'user_id': author.id,
+                    'username': author.username
+                }
+        
+        return None
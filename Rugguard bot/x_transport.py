@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from config import X_API_BASE_URL, X_API_FIXTURES_DIR, X_API_RECORD_DIR
+
+X_API_HOST = 'https://api.twitter.com'
+
+# Query parameters that vary per request and should not affect fixture lookup
+VOLATILE_PARAMS = {'oauth_nonce', 'oauth_timestamp', 'oauth_signature'}
+
+def fixture_key(method, url):
+    """Canonical request identity used to name recorded fixtures"""
+    parts = urlsplit(url)
+    params = sorted((k, v) for k, v in parse_qsl(parts.query) if k not in VOLATILE_PARAMS)
+    query = urlencode(params)
+    return f"{method} {parts.path}" + (f"?{query}" if query else '')
+
+def fixture_filename(key):
+    return hashlib.sha1(key.encode()).hexdigest()[:20] + '.json'
+
+class RedirectAdapter(HTTPAdapter):
+    """Sends X API requests to another base URL, such as the local fake_x_api server"""
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = urlsplit(base_url)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = urlunsplit((self.base_url.scheme, self.base_url.netloc, parts.path, parts.query, parts.fragment))
+        return super().send(request, **kwargs)
+
+class FixtureAdapter(HTTPAdapter):
+    """Replays recorded responses from a directory instead of using the network"""
+
+    def __init__(self, fixtures_dir, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures_dir = fixtures_dir
+        self.logger = logging.getLogger(__name__)
+
+    def _load(self, key):
+        path = os.path.join(self.fixtures_dir, fixture_filename(key))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def send(self, request, **kwargs):
+        key = fixture_key(request.method, request.url)
+        # Fall back to a path-only fixture so one file can serve every query variant
+        fixture = self._load(key) or self._load(key.split('?')[0])
+        if fixture is None:
+            self.logger.warning(f"No fixture recorded for {key}")
+            fixture = {'status': 404, 'headers': {}, 'body': {'title': 'Not Found Error', 'detail': key}}
+
+        response = Response()
+        response.status_code = fixture['status']
+        response.headers = CaseInsensitiveDict(fixture.get('headers', {}))
+        response.headers.setdefault('Content-Type', 'application/json')
+        response._content = json.dumps(fixture['body']).encode()
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if response.status_code < 400 else 'Fixture Error'
+        return response
+
+class RecordingAdapter(HTTPAdapter):
+    """Passes requests through and saves each response as a fixture"""
+
+    def __init__(self, record_dir, inner=None, **kwargs):
+        super().__init__(**kwargs)
+        self.record_dir = record_dir
+        self.inner = inner
+        os.makedirs(record_dir, exist_ok=True)
+
+    def send(self, request, **kwargs):
+        if self.inner is not None:
+            response = self.inner.send(request, **kwargs)
+        else:
+            response = super().send(request, **kwargs)
+
+        key = fixture_key(request.method, request.url)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        fixture = {
+            'request': key,
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower().startswith('x-rate-limit')},
+            'body': body
+        }
+        with open(os.path.join(self.record_dir, fixture_filename(key)), 'w') as f:
+            json.dump(fixture, f, indent=2)
+        return response
+
+def build_adapter():
+    """Build the transport configured in config.py, or None for the real X API"""
+    adapter = None
+    if X_API_FIXTURES_DIR:
+        adapter = FixtureAdapter(X_API_FIXTURES_DIR)
+    elif X_API_BASE_URL:
+        adapter = RedirectAdapter(X_API_BASE_URL)
+
+    if X_API_RECORD_DIR:
+        adapter = RecordingAdapter(X_API_RECORD_DIR, inner=adapter)
+    return adapter
+
+def install_transport(*sessions):
+    """Mount the configured transport on the given requests sessions"""
+    adapter = build_adapter()
+    if adapter is None:
+        return None
+    for session in sessions:
+        session.mount(X_API_HOST, adapter)
+    return adapter